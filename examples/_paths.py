@@ -0,0 +1,14 @@
+"""
+exampleスクリプト共通のパス定数
+
+フォントパスの解決（stat呼び出しを伴う）をモジュール読み込み時に
+1回だけ行い、各スクリプトのビルダーチェーンから参照できるようにします。
+"""
+
+from pathlib import Path
+
+# リポジトリ同梱のNoto Sans JPフォント
+FONT_PATH = str(
+    Path(__file__).resolve().parent.parent / "fonts" / "NotoSansJP-Regular.ttf"
+)
+FONT_NAME = "Noto Sans JP"
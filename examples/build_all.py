@@ -0,0 +1,78 @@
+"""
+すべてのサンプルPDFを並列ビルドするスクリプト
+
+各サンプルは互いに独立したPDFをコンパイルし、LaTeXエンジンは
+1ジョブあたりシングルスレッドで動くため、プロセスプールで
+コア数まで並列化するとほぼ台数分の高速化が見込める。
+共有の.fmt/PDFキャッシュは最初のジョブが温め、以降のジョブが再利用する。
+
+使い方:
+    python examples/build_all.py
+"""
+
+import importlib
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# ビルド対象のサンプルモジュール
+EXAMPLE_MODULES = [
+    "diff_mogi",
+    "explain_function",
+    "explain_sincos",
+    "mosya_p60",
+    "template",
+    "generate",
+]
+
+
+def _run_one(module_name: str) -> str:
+    """
+    サンプルモジュールを読み込んでmain()を実行（サブプロセス内で呼ばれる）
+
+    Args:
+        module_name: examples/内のモジュール名
+
+    Returns:
+        実行したモジュール名
+    """
+    examples_dir = Path(__file__).resolve().parent
+    sys.path.insert(0, str(examples_dir.parent))
+    sys.path.insert(0, str(examples_dir))
+
+    module = importlib.import_module(module_name)
+    module.main()
+    return module_name
+
+
+def main():
+    """すべてのサンプルを並列実行し、結果を報告"""
+    max_workers = min(len(EXAMPLE_MODULES), os.cpu_count() or 1)
+    print(f"{len(EXAMPLE_MODULES)}件のサンプルを{max_workers}並列でビルドします...")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_run_one, name): name
+            for name in EXAMPLE_MODULES
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                print(f"[OK] {name}")
+            except Exception:
+                failed.append(name)
+                print(f"[失敗] {name}")
+                traceback.print_exc()
+
+    if failed:
+        print(f"失敗: {', '.join(failed)}")
+        sys.exit(1)
+    print("すべてのサンプルのビルドが完了しました。")
+
+
+if __name__ == "__main__":
+    main()
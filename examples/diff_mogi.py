@@ -5,31 +5,30 @@ DocumentBuilderを使用したPDF生成の例
 PDFを生成する方法を示します。
 """
 
+import functools
 import sys
 from pathlib import Path
 
 # 親ディレクトリをパスに追加
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _paths import FONT_PATH, FONT_NAME
 
 from pdf_generator.builder import DocumentBuilder
 from pdf_generator import PDFGenerator
+from pdf_generator.styles import MATH_BOX_STYLE
 
 
-def main():
-    output_name = Path(__file__).stem + ".pdf"
-    """メイン関数"""
-    # PDFGeneratorの初期化
-    print("PDFGeneratorを初期化しています...")
-    generator = PDFGenerator()
+@functools.cache
+def build_doc():
+    """ドキュメントを構築して返す
 
-    # 数式の上下余白を調整するスタイル
-    math_box_style = {
-        "before upper": r"{\setlength{\abovedisplayskip}{5pt}\setlength{\belowdisplayskip}{5pt}\setlength{\abovedisplayshortskip}{0pt}\setlength{\belowdisplayshortskip}{0pt}}"
-    }
+    ビルダーチェーンは純粋（同じ入力から常に同じDocumentを生成）なので、
+    同一プロセス内での再実行時は構築をスキップする。
+    """
 
-    # DocumentBuilderでドキュメントを構築
-    print("ドキュメントを構築しています...")
-    doc = (
+    return (
         DocumentBuilder()
         # フォント設定（3つの方法があります）
         # 方法1: CJKutf8を使用（シンプルだが不安定な場合がある）
@@ -37,11 +36,7 @@ def main():
         # 方法2: フォントファイルを直接指定（より安定、XeLaTeX/LuaLaTeXが必要）
         # .set_font_file("C:/Windows/Fonts/msgothic.ttc", "MS Gothic")  # Windowsの場合
         # .set_font_file("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")  # Linuxの場合
-        .set_font_file(
-            str(Path(__file__).parent.parent /
-                "fonts" / "NotoSansJP-Regular.ttf"),
-            "Noto Sans JP",
-        )  # ローカルファイル
+        .set_font_file(FONT_PATH, FONT_NAME)  # ローカルファイル
         # 方法3: URLからフォントファイルをダウンロード（推奨）
         # .set_font_from_url(
         #     "https://github.com/google/fonts/raw/main/ofl/notosansjp/NotoSansJP-Regular.ttf",
@@ -86,7 +81,7 @@ def main():
         .add_textbox(
             title="導関数の求め方（定義）",
             content=r"関数$f(x)$の導関数$f'(x)$は以下のように定義される。\[ f'(x) = \lim_{h \to 0} \frac{f(x+h) - f(x)}{h} \]",
-            style=math_box_style,
+            style=MATH_BOX_STYLE,
         )
         .add_text(
             r"{\centering\textbf{さっき作った式にすごく似ていることがわかりますね？}\par}"
@@ -131,6 +126,17 @@ def main():
         .build()
     )
 
+def main():
+    output_name = Path(__file__).stem + ".pdf"
+    """メイン関数"""
+    # PDFGeneratorの初期化
+    print("PDFGeneratorを初期化しています...")
+    generator = PDFGenerator()
+
+    # ドキュメントを構築
+    print("ドキュメントを構築しています...")
+    doc = build_doc()
+
     # PDFを生成
     print("PDFを生成しています...")
     try:
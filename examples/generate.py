@@ -0,0 +1,101 @@
+"""
+JSONコンテンツ定義からPDFをまとめて生成するスクリプト
+
+examples/content/ 配下の各JSONファイルを1つのドキュメントとして構築し、
+1つのPDFGeneratorで順番にコンパイルします。スクリプトを複製する
+代わりにコンテンツだけを記述すればよく、プリアンブルの.fmtキャッシュと
+フォントキャッシュもすべてのドキュメントで共有されます。
+
+コンテンツ定義の例は examples/content/sample_print.json を参照してください。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 親ディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _paths import FONT_PATH, FONT_NAME
+from pdf_generator import PDFGenerator
+from pdf_generator.builder import DocumentBuilder
+
+CONTENT_DIR = Path(__file__).parent / "content"
+
+
+def _add_element(builder, element: dict):
+    """コンテンツ定義の1要素をビルダーに追加"""
+    element_type = element["type"]
+
+    if element_type == "paragraph":
+        builder.add_paragraph(element["text"], bold=element.get("bold", False))
+    elif element_type == "text":
+        builder.add_text(element["text"], bold=element.get("bold", False))
+    elif element_type == "divider":
+        builder.add_divider()
+    elif element_type == "line":
+        builder.add_line(element["text"])
+    elif element_type == "blank_space":
+        builder.add_blank_space(element["height"])
+    elif element_type == "exercise":
+        builder.add_exercise(
+            element["title"],
+            element["content"],
+            items=element.get("items"),
+            columns=element.get("columns", 1),
+        )
+    else:
+        raise ValueError(f"未対応の要素タイプです: {element_type}")
+
+
+def build_doc_from_spec(spec: dict):
+    """コンテンツ定義（辞書）からDocumentを構築"""
+    builder = DocumentBuilder()
+    builder.set_font_file(FONT_PATH, FONT_NAME)
+
+    margins = spec.get("margins", {})
+    if margins:
+        builder.set_margins(**margins)
+    if spec.get("line_spacing"):
+        builder.set_line_spacing(spec["line_spacing"])
+
+    for section_spec in spec.get("sections", []):
+        section = builder.add_section(section_spec["title"])
+        for element in section_spec.get("elements", []):
+            _add_element(section, element)
+        section.end_section()
+
+    return builder.build()
+
+
+def main():
+    """メイン関数"""
+    print("PDFGeneratorを初期化しています...")
+    generator = PDFGenerator()
+
+    spec_files = sorted(CONTENT_DIR.glob("*.json"))
+    if not spec_files:
+        print(f"コンテンツ定義が見つかりません: {CONTENT_DIR}")
+        return 1
+
+    failed = 0
+    for spec_file in spec_files:
+        print(f"ドキュメントを構築しています: {spec_file.name}")
+        with open(spec_file, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+
+        doc = build_doc_from_spec(spec)
+
+        try:
+            pdf_path = generator.generate(doc, output_name=f"{spec_file.stem}.pdf")
+            print(f"成功: PDFが生成されました: {pdf_path}")
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"エラー: {spec_file.name} の生成に失敗しました: {e}")
+            failed += 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
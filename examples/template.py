@@ -22,11 +22,6 @@ def main():
     print("PDFGeneratorを初期化しています...")
     generator = PDFGenerator()
 
-    # 数式の上下余白を調整するスタイル
-    math_box_style = {
-        "before upper": r"{\setlength{\abovedisplayskip}{5pt}\setlength{\belowdisplayskip}{5pt}\setlength{\abovedisplayshortskip}{0pt}\setlength{\belowdisplayshortskip}{0pt}}"
-    }
-
     # DocumentBuilderでドキュメントを構築
     print("ドキュメントを構築しています...")
     doc = (
@@ -0,0 +1,68 @@
+"""
+複数ドキュメントをまとめて生成するバッチランナー
+"""
+
+import inspect
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .core.document import Document
+from .core.generator import PDFGenerator
+
+
+def run_all(build_funcs: List[Callable[[], Document]],
+            cache_dir: Optional[str] = None,
+            generator: Optional[PDFGenerator] = None) -> List[str]:
+    """
+    複数のドキュメント構築関数を1つのPDFGeneratorで順番にコンパイル
+
+    PDFGeneratorを使い回すことで、フォントキャッシュや.fmtフォーマット
+    キャッシュをドキュメント間で共有できる。XeLaTeX/LuaLaTeXの起動時に
+    支配的なCJKフォントのフォントテーブル構築は、永続キャッシュにより
+    2回目以降のコンパイルで省略される。
+
+    Args:
+        build_funcs: Documentを返す呼び出し可能オブジェクトのリスト
+            （例: 各exampleスクリプトのbuild_doc関数）
+        cache_dir: フォント・フォーマットキャッシュの保存先
+            （省略時は ~/.cache/math-textbook）
+        generator: 使用するPDFGenerator（省略時は新規作成）
+
+    Returns:
+        生成されたPDFファイルのパスのリスト
+
+    Example:
+        # examples/ をsys.pathに追加した上で（パッケージではないため）
+        import diff_mogi
+        import explain_function
+        from pdf_generator.batch import run_all
+
+        run_all([diff_mogi.build_doc, explain_function.build_doc])
+    """
+    cache_path = Path(cache_dir) if cache_dir else (
+        Path.home() / ".cache" / "math-textbook"
+    )
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    # luaotfload/fontspecのフォントキャッシュを実行間で共有する
+    os.environ.setdefault("TEXMFVAR", str(cache_path / "texmf-var"))
+
+    if generator is None:
+        generator = PDFGenerator()
+
+    results = []
+    for build_func in build_funcs:
+        document = build_func()
+
+        # 出力名はbuild_funcの定義元ファイル名から決定（例: diff_mogi.pdf）。
+        # functools.cache等のラッパーは__code__を持たないため、先に
+        # __wrapped__チェーンを剥がして元の関数を参照する
+        output_name = None
+        code = getattr(inspect.unwrap(build_func), "__code__", None)
+        if code is not None:
+            output_name = f"{Path(code.co_filename).stem}.pdf"
+
+        results.append(generator.generate(document, output_name=output_name))
+
+    return results
@@ -2,7 +2,18 @@
 ドキュメントを構築するビルダークラス
 """
 
-from typing import Optional, Dict, List, Union, Any
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Optional, Dict, List, Sequence, Union, Any
 from ..core.document import Document
 from ..elements.structure import Section, DrawingSpace, Exercise, BlankSpace
 from ..elements.graphics import Image, TikZ
@@ -11,824 +22,981 @@ from ..elements.text import Text, Paragraph, List as ListElement, Line, Divider
 from ..elements.math import Equation, Align
 from ..elements.tables import Table
 
+logger = logging.getLogger(__name__)
 
-class DocumentBuilder:
-    """ドキュメントを構築するビルダークラス"""
-    
-    def __init__(self, title: Optional[str] = None, author: str = "", date: Optional[str] = None):
-        self.document = Document(title, author, date)
-        self.current_section: Optional[Section] = None
-    
-    def _add_line_to_container(self, container: Any, text: str,
-                               line_style: str = "solid",
-                               line_thickness: str = "0.4pt",
-                               color: Optional[str] = None):
-        """
-        装飾線付きテキストをコンテナに追加する共通メソッド（例: ----解答----）
-        
-        Args:
-            container: 追加先のコンテナ（document, section, drawing_spaceなど）
-            text: 中央に表示するテキスト
-            line_style: 線のスタイル
-                - "solid": 実線（デフォルト）
-                - "dashed": 破線
-                - "dotted": 点線
-                - "double": 二重線
-            line_thickness: 線の太さ（例: "0.4pt", "1pt", "5pt"）
-            color: 線の色（例: "gray", "grey", "black", "red"など。Noneの場合は黒）
-        """
-        # 色が指定されている場合はxcolorパッケージを追加
-        if color:
-            self.add_package("xcolor")
-        line = Line(text, line_style=line_style, line_thickness=line_thickness,
-                    color=color)
-        container.add(line)
-    
-    def set_title(self, title: str):
-        """
-        タイトルを設定
-        
-        Args:
-            title: タイトル文字列
-        
-        Returns:
-            self（メソッドチェーン用）
-        """
-        self.document.title = title
-        return self
-    
-    def set_abstract(self, abstract: str):
-        """アブストラクトを設定"""
-        self.document.set_abstract(abstract)
-        return self
-    
-    def set_font(self, font: str):
+# インターンする文字列の最大長
+# 問題集では同じLaTeX断片（\textbf{...}等）が大量に繰り返されるため、
+# 短い文字列は共有して重複分のメモリを節約する
+_INTERN_MAX_LENGTH = 256
+
+# .cache.jsonの読み書きを直列化するロック（set_fonts_from_urlsの並列実行用）
+_FONT_META_LOCK = threading.Lock()
+
+# Content-Dispositionヘッダーからファイル名を取り出すパターン
+# （RFC 5987のfilename*=UTF-8''〜形式と通常のfilename=〜形式の両対応）
+_CONTENT_DISPOSITION_RE = re.compile(
+    r"""filename\*?=(?:UTF-8''(?P<enc>[^;]+)|"?(?P<plain>[^";]+)"?)""",
+    re.IGNORECASE,
+)
+
+# add_abstract用のラッパーテンプレート（呼び出しごとのf-string構築を避ける）
+_ABSTRACT_BOLD_CENTERED = "\\begin{center}\n\\textbf{%s}\n\\end{center}"
+_ABSTRACT_BOLD = "\\textbf{%s}"
+_ABSTRACT_CENTERED = "\\begin{center}\n%s\n\\end{center}"
+
+
+def _format_abstract(text: str, bold: bool, centered: bool) -> str:
+    """概要テキストを装飾用テンプレートに適用する"""
+    if bold and centered:
+        return _ABSTRACT_BOLD_CENTERED % text
+    if bold:
+        return _ABSTRACT_BOLD % text
+    if centered:
+        return _ABSTRACT_CENTERED % text
+    return text
+
+
+def _intern_short(text: str) -> str:
+    """短い文字列をインターンして返す（長い文字列はそのまま）"""
+    if len(text) < _INTERN_MAX_LENGTH:
+        return sys.intern(text)
+    return text
+
+
+# 作成済みディレクトリのキャッシュ（set_font_from_urlの呼び出しごとの
+# mkdir syscallを初回のみにする。set.addはCPythonではアトミックなので
+# 並列ダウンロードからも安全に使える）
+_ensured_dirs: set = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """ディレクトリを作成する（同じパスは1プロセスにつき1回だけsyscall）"""
+    if path in _ensured_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_fonts_dir() -> str:
+    """
+    設定からフォント保存先ディレクトリを取得（プロセスごとに1回だけ）
+
+    set_font_from_urlが呼ばれるたびに設定ファイルを読み直さないよう、
+    初回の結果をキャッシュする。設定が読めない場合は"fonts"を返す。
+    """
+    try:
+        from ..config import ConfigManager
+        config = ConfigManager()
+        config.load_config()
+        return config.get("directories.fonts_dir", "fonts")
+    except Exception:
+        return "fonts"
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_font_path(font_file: str) -> tuple:
+    """
+    フォントパスを(絶対パス, 既定フォント名)に解決（存在確認込み、結果はキャッシュ）
+
+    Path.resolve(strict=True)はパス要素ごとにstatを発行するため、
+    存在確認のos.statを1回だけにして残りは文字列操作で済ませる。
+    同じフォントを複数のビルダーで使い回すバッチ生成では、パスごとに
+    syscallが1回で済む。存在しない場合のOSErrorはキャッシュされない
+    ため、後からファイルを置けば再試行できる。
+    """
+    os.stat(font_file)
+    abs_path = os.path.abspath(font_file)
+    stem = os.path.splitext(os.path.basename(abs_path))[0]
+    return abs_path, stem
+
+
+class _ContainerBuilderMixin:
+    """
+    各ビルダーに共通するadd_*メソッドをまとめたミックスイン
+
+    Document/Section/DrawingSpaceは要素の追加先こそ違うものの、
+    要素を生成して追加する処理自体は同一なため、ここで一元管理する。
+    追加先は_containerプロパティで、パッケージ登録などドキュメント
+    全体に関わる操作は_rootプロパティで各ビルダーが差し替える。
+    """
+
+    __slots__ = ()
+
+    # add_tikzでinlineを省略した場合のデフォルト
+    # （DrawingSpace内ではfigure環境が使えないため、
+    # DrawingSpaceBuilderのみTrueに上書きする）
+    _TIKZ_INLINE_DEFAULT = False
+
+    @property
+    def _container(self) -> Any:
+        """要素の追加先（Document/Section/DrawingSpace）"""
+        raise NotImplementedError
+
+    @property
+    def _root(self) -> 'DocumentBuilder':
+        """パッケージ登録などに使う大元のDocumentBuilder"""
+        raise NotImplementedError
+
+    def add_text(self, text: str, bold: bool = False):
         """
-        フォントを設定（CJKutf8用）
-        
+        テキストを追加
+
         Args:
-            font: フォント名（CJKutf8用）
-                - "min": 明朝体（デフォルト）
-                - "goth": ゴシック体
-        
-        Note:
-            フォントファイルを指定する場合は、set_font_file()を使用してください。
+            text: テキスト文字列
+            bold: 太字にするかどうか（デフォルト: False）
         """
-        self.document.font = font
+        self._container.add(Text(_intern_short(text), bold=bold))
         return self
-    
-    def set_font_file(self, font_file: str, font_name: Optional[str] = None):
+
+    def add_texts(self, *texts: str, bold: bool = False):
         """
-        フォントファイルを設定（XeLaTeX/LuaLaTeX用）
-        
+        複数のテキストを一括追加（要素ごとのadd_text呼び出しより低オーバーヘッド）
+
         Args:
-            font_file: フォントファイルのパス（.ttf, .otfなど）
-            font_name: フォント名（省略時はファイル名から自動生成）
-        
-        Note:
-            フォントファイルを指定すると、自動的にXeLaTeXまたはLuaLaTeXが使用されます。
-            より安定したフォント表示が可能です。
-        
+            *texts: テキスト文字列（可変長）
+            bold: 太字にするかどうか（すべての要素に適用、デフォルト: False）
+
         Example:
-            .set_font_file("C:/Windows/Fonts/msgothic.ttc", "MS Gothic")
-            .set_font_file("fonts/NotoSansJP-Regular.ttf", "Noto Sans JP")
+            .add_texts("1行目", "2行目", "3行目")
         """
-        from pathlib import Path
-        font_path = Path(font_file)
-        if not font_path.exists():
-            raise FileNotFoundError(f"フォントファイルが見つかりません: {font_file}")
-        
-        self.document.font_file = str(font_path.absolute())
-        self.document.font_name = font_name or font_path.stem
+        self._container.add_many(
+            [Text(_intern_short(text), bold=bold) for text in texts]
+        )
         return self
-    
-    def set_font_from_url(self, url: str, font_name: Optional[str] = None, 
-                         fonts_dir: Optional[str] = None) -> 'DocumentBuilder':
-        """
-        URLからフォントファイルをダウンロードして設定
-        
-        Args:
-            url: フォントファイルのURL
-            font_name: フォント名（省略時はファイル名から自動生成）
-            fonts_dir: フォント保存先ディレクトリ（省略時はconfigから取得、デフォルト: fonts）
-        
-        Returns:
-            self（メソッドチェーン用）
-        
-        Example:
-            .set_font_from_url("https://example.com/fonts/NotoSansJP-Regular.ttf", "Noto Sans JP")
-        """
-        import urllib.request
-        import urllib.parse
-        from pathlib import Path
-        
-        # フォント保存先の決定
-        if fonts_dir is None:
-            # 設定から取得（デフォルト: fonts）
-            try:
-                from ..config import ConfigManager
-                config = ConfigManager()
-                config.load_config()
-                fonts_dir = config.get("directories.fonts_dir", "fonts")
-            except Exception:
-                fonts_dir = "fonts"
-        
-        fonts_path = Path(fonts_dir)
-        fonts_path.mkdir(parents=True, exist_ok=True)
-        
-        # ファイル名をURLから取得
-        parsed_url = urllib.parse.urlparse(url)
-        filename = Path(parsed_url.path).name
-        
-        # ファイル名が取得できない場合や拡張子がない場合の処理
-        if not filename or not filename.endswith(('.ttf', '.otf', '.ttc', '.woff', '.woff2')):
-            # Content-Dispositionヘッダーから取得を試みる
-            try:
-                req = urllib.request.Request(url)
-                with urllib.request.urlopen(req) as response:
-                    content_disposition = response.headers.get('Content-Disposition', '')
-                    if 'filename=' in content_disposition:
-                        filename = content_disposition.split('filename=')[1].strip('"\'')
-                    elif 'filename*=' in content_disposition:
-                        # RFC 5987形式の処理
-                        filename_part = content_disposition.split('filename*=')[1].split(';')[0]
-                        if filename_part.startswith("UTF-8''"):
-                            filename = urllib.parse.unquote(filename_part[7:])
-                        else:
-                            filename = filename_part.strip('"\'')
-            except Exception:
-                # デフォルト名を使用
-                filename = "font.ttf"
-        
-        font_file_path = fonts_path / filename
-        
-        # ダウンロード
-        print(f"フォントファイルをダウンロード中: {url}")
-        try:
-            urllib.request.urlretrieve(url, font_file_path)
-            print(f"フォントファイルを保存しました: {font_file_path}")
-        except Exception as e:
-            raise RuntimeError(f"フォントファイルのダウンロードに失敗しました: {e}") from e
-        
-        # フォントを設定
-        return self.set_font_file(str(font_file_path.absolute()), font_name)
-    
-    def set_margins(self, top: Optional[str] = None, bottom: Optional[str] = None,
-                    left: Optional[str] = None, right: Optional[str] = None):
+
+    def add_paragraph(self, text: str, bold: bool = False):
         """
-        余白を設定
-        
+        段落を追加
+
         Args:
-            top: 上余白（例: "2cm"）
-            bottom: 下余白（例: "2cm"）
-            left: 左余白（例: "2cm"）
-            right: 右余白（例: "2cm"）
+            text: 段落のテキスト
+            bold: 太字にするかどうか（デフォルト: False）
         """
-        if top is not None:
-            self.document.margins["top"] = top
-        if bottom is not None:
-            self.document.margins["bottom"] = bottom
-        if left is not None:
-            self.document.margins["left"] = left
-        if right is not None:
-            self.document.margins["right"] = right
+        self._container.add(Paragraph(_intern_short(text), bold=bold))
         return self
-    
-    def set_line_spacing(self, spacing: float):
+
+    def add_paragraphs(self, *texts: str, bold: bool = False):
         """
-        行間を設定
-        
+        複数の段落を一括追加（要素ごとのadd_paragraph呼び出しより低オーバーヘッド）
+
+        データソースから大量の段落を流し込むバッチ生成向け。
+        要素リストをまとめてコンテナに渡すため、追加はC実装の
+        list.extend一回で済む。
+
         Args:
-            spacing: 行間の倍率（例: 1.5 で1.5倍の行間、2.0 で2倍の行間）
-        
+            *texts: 段落のテキスト（可変長）
+            bold: 太字にするかどうか（すべての要素に適用、デフォルト: False）
+
         Example:
-            .set_line_spacing(1.5)  # 1.5倍の行間を設定
-        """
-        if spacing <= 0:
-            raise ValueError("行間の倍率は0より大きい値である必要があります")
-        self.document.line_spacing = spacing
-        return self
-    
-    def add_package(self, package: str, options: Optional[str] = None):
-        """パッケージを追加"""
-        self.document.preamble_manager.add_package(package, options)
-        return self
-    
-    def add_section(self, title: str, level: int = 1, label: Optional[str] = None, numbered: bool = False) -> 'SectionBuilder':
-        """
-        セクションを追加
-        
-        Args:
-            title: セクションのタイトル
-            level: セクションのレベル（1: section, 2: subsection, ...）
-            label: 参照用のラベル
-            numbered: 番号を振るかどうか（デフォルト: False）
-        """
-        section = Section(title, level=level, label=label, numbered=numbered)
-        self.document.add(section)
-        self.current_section = section
-        return SectionBuilder(self, section)
-    
-    def add_text(self, text: str, bold: bool = False):
-        """
-        テキストを追加
-        
-        Args:
-            text: テキスト文字列
-            bold: 太字にするかどうか（デフォルト: False）
+            .add_paragraphs("1段落目", "2段落目", "3段落目")
         """
-        self.document.add(Text(text, bold=bold))
+        self._container.add_many(
+            [Paragraph(_intern_short(text), bold=bold) for text in texts]
+        )
         return self
-    
+
     def add_abstract(self, text: str, bold: bool = True, centered: bool = True):
         """
         アブストラクト（概要）を追加
-        
+
         Args:
             text: 表示するテキスト
             bold: 太字にするかどうか（デフォルト: True）
             centered: 中央寄せにするかどうか（デフォルト: True）
-        
+
         Note:
             呼び出した位置（Document/Sectionの要素列）にそのまま挿入されます。
         """
-        formatted_text = text
-        if bold:
-            formatted_text = f"\\textbf{{{formatted_text}}}"
-        if centered:
-            formatted_text = f"\\begin{{center}}\n{formatted_text}\n\\end{{center}}"
-        self.document.add(Paragraph(formatted_text))
-        return self
-    
-    def add_paragraph(self, text: str, bold: bool = False):
-        """
-        段落を追加
-        
-        Args:
-            text: 段落のテキスト
-            bold: 太字にするかどうか（デフォルト: False）
-        """
-        self.document.add(Paragraph(text, bold=bold))
+        self._container.add(Paragraph(_format_abstract(text, bold, centered)))
         return self
-    
-    def add_line(self, text: str, 
+
+    def add_line(self, text: str,
                  line_style: str = "solid",
                  line_thickness: str = "5pt",
                  color: Optional[str] = "gray"):
         """装飾線付きテキストを追加（例: ----解答----）"""
-        self._add_line_to_container(self.document, text, line_style, line_thickness,
-                                    color)
+        self._root._add_line_to_container(self._container, text, line_style,
+                                          line_thickness, color)
         return self
-    
+
     def add_divider(self, symbol: str = "*", spacing: str = "10em",
-                    vspace: str = "0.0em", 
+                    vspace: str = "0.0em",
                     vspace_before: Optional[str] = None,
                     vspace_after: Optional[str] = None):
         """
         軽い区切りを追加（例: *        *        *）
-        
+
         Args:
             symbol: 区切りに使用する記号（デフォルト: "*"）
             spacing: 記号間の間隔（デフォルト: "10em"、例: "1em", "1.5em", "10em"など）
             vspace: 上下の余白（デフォルト: "-1em"、負の値で余白を減らす）
             vspace_before: 上の余白（指定時はvspaceより優先）
             vspace_after: 下の余白（指定時はvspaceより優先）
-        
+
         Returns:
             self（メソッドチェーン用）
         """
-        self.document.add(Divider(symbol=symbol, spacing=spacing, vspace=vspace, 
-                                  vspace_before=vspace_before, 
-                                  vspace_after=vspace_after))
+        # スタイル文字列は同じ値が大量に繰り返されるためインターンして共有
+        self._container.add(Divider(
+            symbol=sys.intern(symbol), spacing=sys.intern(spacing),
+            vspace=sys.intern(vspace),
+            vspace_before=sys.intern(vspace_before) if vspace_before else None,
+            vspace_after=sys.intern(vspace_after) if vspace_after else None))
         return self
-    
+
     def add_image(self, image_path: str, caption: Optional[str] = None,
                   width: str = "0.8", label: Optional[str] = None):
         """画像を追加"""
         img = Image(image_path, caption=caption, width=width, label=label)
-        self.document.add(img)
+        self._container.add(img)
         return self
-    
-    def add_tikz(self, code: str, caption: Optional[str] = None, label: Optional[str] = None, 
-                 libraries: Optional[List[str]] = None, inline: bool = False):
+
+    def add_tikz(self, code: str, caption: Optional[str] = None, label: Optional[str] = None,
+                 libraries: Optional[List[str]] = None, inline: Optional[bool] = None):
         """
         TikZ図形を追加
-        
+
         Args:
             code: TikZコード
             caption: キャプション
             label: ラベル
             libraries: 必要なTikZライブラリのリスト
             inline: インライン表示するかどうか
+                （省略時はビルダーごとのデフォルト。DrawingSpace内では
+                figure環境が使えないためTrue、それ以外はFalse）
         """
-        self.add_package("tikz")
+        if inline is None:
+            inline = self._TIKZ_INLINE_DEFAULT
+        self._root.add_package("tikz")
         if libraries:
+            preamble_manager = self._root.document.preamble_manager
             for lib in libraries:
                 cmd = f"\\usetikzlibrary{{{lib}}}"
-                if cmd not in self.document.preamble_manager.custom_commands:
-                    self.document.preamble_manager.add_command(cmd)
-                    
+                if cmd not in preamble_manager.custom_commands:
+                    preamble_manager.add_command(cmd)
+
         tikz = TikZ(code, caption=caption, label=label, libraries=libraries, inline=inline)
-        self.document.add(tikz)
+        self._container.add(tikz)
         return self
-    
+
     def add_textbox(self, content: str, title: Optional[str] = None,
                    box_type: str = "tcolorbox", style: Optional[Dict[str, str]] = None):
         """テキストボックスを追加"""
         box = TextBox(content, title=title, box_type=box_type, style=style)
-        self.document.add(box)
+        self._container.add(box)
         return self
-    
+
     def add_note(self, content: str):
         """注意書きを追加"""
-        self.document.add(Note(content))
+        self._container.add(Note(content))
         return self
-    
+
     def add_warning(self, content: str):
         """警告を追加"""
-        self.document.add(Warning(content))
+        self._container.add(Warning(content))
         return self
-    
+
     def add_info(self, content: str):
         """情報を追加"""
-        self.document.add(Info(content))
+        self._container.add(Info(content))
         return self
-    
+
     def add_equation(self, equation: str, inline: bool = False, label: Optional[str] = None):
         """数式を追加"""
         eq = Equation(equation, inline=inline, label=label)
-        self.document.add(eq)
+        self._container.add(eq)
+        return self
+
+    def add_equations(self, *equations: str, inline: bool = False):
+        """
+        複数の数式を一括追加（要素ごとのadd_equation呼び出しより低オーバーヘッド）
+
+        Args:
+            *equations: 数式（可変長）
+            inline: インライン表示するかどうか（すべての要素に適用）
+
+        Example:
+            .add_equations("E = mc^2", "F = ma")
+        """
+        self._container.add_many(
+            [Equation(equation, inline=inline) for equation in equations]
+        )
+        return self
+
+    def add_align(self, equations: Sequence[str], label: Optional[str] = None, numbered: bool = False, vspace: Optional[str] = None):
+        """
+        複数行の数式を追加
+
+        Args:
+            equations: 数式のシーケンス（リスト・タプル・ジェネレータ等）
+            label: ラベル
+            numbered: 番号を振るかどうか
+            vspace: 直前の余白調整（例: "-1em", "5pt"）
+        """
+        align = Align(equations, label=label, numbered=numbered, vspace=vspace)
+        self._container.add(align)
+        return self
+
+    def add_list(self, items: Sequence[str], ordered: bool = False):
+        """リストを追加"""
+        lst = ListElement(items, ordered=ordered)
+        self._container.add(lst)
         return self
-    
-    def add_table(self, headers: List[str], rows: List[List[str]],
+
+    def add_table(self, headers: Sequence[str], rows: Sequence[Sequence[str]],
                   caption: Optional[str] = None, label: Optional[str] = None):
         """テーブルを追加"""
         table = Table(headers, rows, caption=caption, label=label)
-        self.document.add(table)
+        self._container.add(table)
         return self
-    
+
     def add_blank_space(self, height: str):
         """
         手書き用の空白スペースを追加
-        
+
         Args:
             height: 空白の高さ（例: "5cm", "50mm", "10em"）
         """
-        self.document.add(BlankSpace(height))
+        self._container.add(BlankSpace(height))
         return self
-    
-    def add_drawing_space(self, width: str = "0.7\\textwidth", 
-                         right_margin: str = "5cm",
-                         margin_image: Optional[str] = None,
-                         margin_content: Optional[Any] = None) -> 'DrawingSpaceBuilder':
-        """
-        手書き用の余白を確保する領域を追加
-        
-        Args:
-            width: コンテンツの幅（例: "0.7\\textwidth", "10cm"）
-            right_margin: 右側の余白幅（例: "3cm", "5cm"）
-            margin_image: 右側の余白に表示する画像のパス（オプション）
-            margin_content: 右側の余白に表示するコンテンツ（TikZオブジェクトなど。margin_imageより優先度は低い）
-        
-        Returns:
-            DrawingSpaceBuilder（メソッドチェーン用）
-        
-        Example:
-            .add_drawing_space(right_margin="5cm", margin_image="fig.png")
-                .add_paragraph("この部分だけ右側に余白（図）があります")
-                .end_drawing_space()
-        """
-        final_margin_content = margin_content
-        
-        if margin_image:
-            # マージン領域の幅に合わせて画像を表示
-            final_margin_content = Image(margin_image, width="1.0\\linewidth", inline=True)
-            
-        drawing_space = DrawingSpace(width=width, right_margin=right_margin, margin_content=final_margin_content)
-        self.document.add(drawing_space)
-        return DrawingSpaceBuilder(self, drawing_space, parent_builder=self)
-    
+
     def add_exercise(self, title: str, content: str, items: Optional[List[str]] = None, columns: int = 1):
         """
         小問（練習問題）を追加
-        
+
         Args:
             title: 小問のタイトル（例: "練習4"）
             content: 問題の本文
             items: 小問のリスト（例: ["$f(x) = x^2$", "$f(x) = 3x + 1$"]）
             columns: 列数（1: 縦並び, 2以上: 横並び（段組み））
-        
+
         Returns:
             self（メソッドチェーン用）
-        
+
         Example:
             .add_exercise("練習4", "次の関数を微分せよ。", items=["$f(x) = x^2$", "$f(x) = 3x + 1$"], columns=2)
         """
         if columns > 1:
-            self.add_package("multicol")
+            self._root.add_package("multicol")
         exercise = Exercise(title=title, content=content, items=items, columns=columns)
-        self.document.add(exercise)
+        self._container.add(exercise)
         return self
-    
-    def build(self) -> Document:
-        """ドキュメントを構築"""
-        return self.document
 
 
-class SectionBuilder:
-    """セクションを構築するビルダー"""
-    
-    def __init__(self, doc_builder: DocumentBuilder, section: Section):
-        self.doc_builder = doc_builder
-        self.section = section
-    
-    def add_text(self, text: str, bold: bool = False):
+class DocumentBuilder(_ContainerBuilderMixin):
+    """ドキュメントを構築するビルダークラス"""
+
+    # __dict__を持たせず属性をスロット化（インスタンスあたり200バイト超の
+    # 節約と属性アクセスの高速化。セクションごとにビルダーを量産する
+    # スクリプトで効く）
+    __slots__ = ("_document", "_init_args", "current_section", "_added_packages")
+
+    def __init__(self, title: Optional[str] = None, author: str = "", date: Optional[str] = None):
+        # Documentの生成は初回アクセスまで遅延する（documentプロパティ参照）
+        self._document: Optional[Document] = None
+        self._init_args = (title, author, date)
+        self.current_section: Optional[Section] = None
+        # 追加済みパッケージの(名前, オプション)ペア
+        # add_lineのxcolor等、同じパッケージを何百回も追加しようとする
+        # 呼び出しをプリアンブルに触れずに弾くためのガード
+        self._added_packages: set = set()
+
+    @property
+    def document(self) -> Document:
         """
-        テキストを追加
-        
-        Args:
-            text: テキスト文字列
-            bold: 太字にするかどうか（デフォルト: False）
+        構築対象のDocument（初回アクセス時に生成）
+
+        Document生成はPreambleManagerやレンダラーの割り当てを伴うため、
+        ダウンロードだけに使う使い捨てビルダー（set_fonts_from_urlsの
+        ワーカー等）では触らない限りコストを払わずに済む。
         """
-        self.section.add(Text(text, bold=bold))
+        if self._document is None:
+            self._document = Document(*self._init_args)
+        return self._document
+
+    @property
+    def _container(self) -> Document:
+        return self.document
+
+    @property
+    def _root(self) -> 'DocumentBuilder':
         return self
-    
-    def add_paragraph(self, text: str, bold: bool = False):
+
+    def _add_line_to_container(self, container: Any, text: str,
+                               line_style: str = "solid",
+                               line_thickness: str = "0.4pt",
+                               color: Optional[str] = None):
         """
-        段落を追加
-        
+        装飾線付きテキストをコンテナに追加する共通メソッド（例: ----解答----）
+
         Args:
-            text: 段落のテキスト
-            bold: 太字にするかどうか（デフォルト: False）
+            container: 追加先のコンテナ（document, section, drawing_spaceなど）
+            text: 中央に表示するテキスト
+            line_style: 線のスタイル
+                - "solid": 実線（デフォルト）
+                - "dashed": 破線
+                - "dotted": 点線
+                - "double": 二重線
+            line_thickness: 線の太さ（例: "0.4pt", "1pt", "5pt"）
+            color: 線の色（例: "gray", "grey", "black", "red"など。Noneの場合は黒）
         """
-        self.section.add(Paragraph(text, bold=bold))
-        return self
-    
-    def add_line(self, text: str, 
-                 line_style: str = "solid",
-                 line_thickness: str = "5pt",
-                 color: Optional[str] = "gray"):
-        """装飾線付きテキストを追加（例: ----解答----）"""
-        self.doc_builder._add_line_to_container(self.section, text, line_style, line_thickness,
-                                                 color)
-        return self
-    
-    def add_divider(self, symbol: str = "*", spacing: str = "10em",
-                    vspace: str = "0.0em", 
-                    vspace_before: Optional[str] = None,
-                    vspace_after: Optional[str] = None):
+        # 色が指定されている場合はxcolorパッケージを追加
+        if color:
+            self.add_package("xcolor")
+        # スタイル文字列は数千の要素で同じ値が繰り返されるためインターンして共有
+        line = Line(text, line_style=sys.intern(line_style),
+                    line_thickness=sys.intern(line_thickness),
+                    color=sys.intern(color) if color else None)
+        container.add(line)
+
+    def set_title(self, title: str):
         """
-        軽い区切りを追加（例: *        *        *）
-        
+        タイトルを設定
+
         Args:
-            symbol: 区切りに使用する記号（デフォルト: "*"）
-            spacing: 記号間の間隔（デフォルト: "10em"、例: "1em", "1.5em", "10em"など）
-            vspace: 上下の余白（デフォルト: "-1em"、負の値で余白を減らす）
-            vspace_before: 上の余白（指定時はvspaceより優先）
-            vspace_after: 下の余白（指定時はvspaceより優先）
-        
+            title: タイトル文字列
+
         Returns:
             self（メソッドチェーン用）
         """
-        self.section.add(Divider(symbol=symbol, spacing=spacing, vspace=vspace, 
-                                 vspace_before=vspace_before, 
-                                 vspace_after=vspace_after))
-        return self
-    
-    def add_image(self, image_path: str, caption: Optional[str] = None,
-                  width: str = "0.8", label: Optional[str] = None):
-        """画像を追加"""
-        img = Image(image_path, caption=caption, width=width, label=label)
-        self.section.add(img)
+        self.document.title = title
         return self
-    
-    def add_tikz(self, code: str, caption: Optional[str] = None, label: Optional[str] = None, 
-                 libraries: Optional[List[str]] = None, inline: bool = False):
-        """TikZ図形を追加"""
-        self.doc_builder.add_package("tikz")
-        if libraries:
-            for lib in libraries:
-                cmd = f"\\usetikzlibrary{{{lib}}}"
-                if cmd not in self.doc_builder.document.preamble_manager.custom_commands:
-                    self.doc_builder.document.preamble_manager.add_command(cmd)
 
-        tikz = TikZ(code, caption=caption, label=label, libraries=libraries, inline=inline)
-        self.section.add(tikz)
-        return self
-    
-    def add_textbox(self, content: str, title: Optional[str] = None,
-                   box_type: str = "tcolorbox", style: Optional[Dict[str, str]] = None):
-        """テキストボックスを追加"""
-        box = TextBox(content, title=title, box_type=box_type, style=style)
-        self.section.add(box)
-        return self
-    
-    def add_note(self, content: str):
-        """注意書きを追加"""
-        from ..elements.boxes import Note
-        self.section.add(Note(content))
-        return self
-    
-    def add_warning(self, content: str):
-        """警告を追加"""
-        from ..elements.boxes import Warning
-        self.section.add(Warning(content))
-        return self
-    
-    def add_info(self, content: str):
-        """情報を追加"""
-        from ..elements.boxes import Info
-        self.section.add(Info(content))
-        return self
-    
-    def add_equation(self, equation: str, inline: bool = False, label: Optional[str] = None):
-        """数式を追加"""
-        eq = Equation(equation, inline=inline, label=label)
-        self.section.add(eq)
+    def set_abstract(self, abstract: str):
+        """アブストラクトを設定"""
+        self.document.set_abstract(abstract)
         return self
-    
-    def add_align(self, equations: List[str], label: Optional[str] = None, numbered: bool = False, vspace: Optional[str] = None):
+
+    def set_font(self, font: str):
         """
-        複数行の数式を追加
-        
+        フォントを設定（CJKutf8用）
+
         Args:
-            equations: 数式のリスト
-            label: ラベル
-            numbered: 番号を振るかどうか
-            vspace: 直前の余白調整（例: "-1em", "5pt"）
+            font: フォント名（CJKutf8用）
+                - "min": 明朝体（デフォルト）
+                - "goth": ゴシック体
+
+        Note:
+            フォントファイルを指定する場合は、set_font_file()を使用してください。
         """
-        align = Align(equations, label=label, numbered=numbered, vspace=vspace)
-        self.section.add(align)
+        self.document.font = font
         return self
-    
-    def add_list(self, items: List[str], ordered: bool = False):
-        """リストを追加"""
-        lst = ListElement(items, ordered=ordered)
-        self.section.add(lst)
+
+    def set_font_file(self, font_file: str, font_name: Optional[str] = None):
+        """
+        フォントファイルを設定（XeLaTeX/LuaLaTeX用）
+
+        Args:
+            font_file: フォントファイルのパス（.ttf, .otfなど）
+            font_name: フォント名（省略時はファイル名から自動生成）
+
+        Note:
+            フォントファイルを指定すると、自動的にXeLaTeXまたはLuaLaTeXが使用されます。
+            より安定したフォント表示が可能です。
+
+        Example:
+            .set_font_file("C:/Windows/Fonts/msgothic.ttc", "MS Gothic")
+            .set_font_file("fonts/NotoSansJP-Regular.ttf", "Noto Sans JP")
+        """
+        try:
+            resolved, stem = _resolve_font_path(font_file)
+        except OSError:
+            raise FileNotFoundError(f"フォントファイルが見つかりません: {font_file}")
+
+        self.document.font_file = resolved
+        self.document.font_name = font_name or stem
         return self
-    
-    def add_table(self, headers: List[str], rows: List[List[str]],
-                  caption: Optional[str] = None, label: Optional[str] = None):
-        """テーブルを追加"""
-        table = Table(headers, rows, caption=caption, label=label)
-        self.section.add(table)
+
+    def set_font_from_url(self, url: str, font_name: Optional[str] = None,
+                         fonts_dir: Optional[str] = None,
+                         expected_sha256: Optional[str] = None) -> 'DocumentBuilder':
+        """
+        URLからフォントファイルをダウンロードして設定
+
+        Args:
+            url: フォントファイルのURL
+            font_name: フォント名（省略時はファイル名から自動生成）
+            fonts_dir: フォント保存先ディレクトリ（省略時はconfigから取得、デフォルト: fonts）
+            expected_sha256: 期待するSHA256ハッシュ（指定時は不一致でエラー）
+
+        Returns:
+            self（メソッドチェーン用）
+
+        Raises:
+            RuntimeError: ダウンロード失敗時、またはexpected_sha256と不一致の場合
+
+        Note:
+            ハッシュはダウンロードの書き込みループ内で計算するため、
+            ファイルを読み直す追加I/Oは発生しない（SHA-NI対応CPUでは
+            ハッシュ計算自体もネットワーク帯域に比べて実質無料）。
+
+        Example:
+            .set_font_from_url("https://example.com/fonts/NotoSansJP-Regular.ttf", "Noto Sans JP")
+        """
+        import hashlib
+        # フォント保存先の決定（設定の読み込みはプロセスごとに1回）
+        if fonts_dir is None:
+            fonts_dir = _default_fonts_dir()
+
+
+        fonts_path = Path(fonts_dir)
+        _ensure_dir(str(fonts_path))
+
+        # ダウンロードキャッシュのメタデータを確認
+        # （URLごとにファイル名・ETag・内容ハッシュを.cache.jsonに記録）
+        meta = self._load_font_cache_meta(fonts_path)
+        entry = meta.get(url, {})
+        cached_file = (fonts_path / entry["filename"]) if entry.get("filename") else None
+
+        # 内容ハッシュが一致する場合はネットワークに触れずに再利用
+        # （expected_sha256指定時はそれとも一致する場合のみ）
+        if (cached_file is not None and cached_file.exists()
+                and entry.get("sha256")
+                and (expected_sha256 is None or entry["sha256"] == expected_sha256)
+                and self._font_sha256(cached_file) == entry["sha256"]):
+            return self.set_font_file(str(cached_file.absolute()), font_name)
+
+        # ハッシュ未記録のキャッシュがある場合は条件付きGETで304を狙う
+        # （ハッシュ照合に失敗したファイルは壊れている可能性があるため全再取得）
+        request_headers = {}
+        if (cached_file is not None and cached_file.exists()
+                and not entry.get("sha256")):
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        # ファイル名をURLから取得
+        parsed_url = urllib.parse.urlparse(url)
+        filename = Path(parsed_url.path).name
+
+        # ファイル名が取得できない場合はGETを一度だけ発行し、
+        # Content-Dispositionヘッダーの確認とダウンロードを同じ接続で行う
+        # （以前はヘッダー確認用とダウンロード用で2回接続していた）
+        response = None
+        if not filename or not filename.endswith(('.ttf', '.otf', '.ttc', '.woff', '.woff2')):
+            try:
+                response = urllib.request.urlopen(url, timeout=30)
+                content_disposition = response.headers.get('Content-Disposition', '')
+                match = _CONTENT_DISPOSITION_RE.search(content_disposition)
+                if match is None:
+                    filename = "font.ttf"
+                elif match['enc']:
+                    # RFC 5987形式（filename*=UTF-8''%E3%81%82.ttf）
+                    filename = urllib.parse.unquote(match['enc'])
+                else:
+                    filename = match['plain'].strip('"\'')
+            except Exception:
+                # デフォルト名を使用
+                filename = "font.ttf"
+
+        font_file_path = fonts_path / filename
+
+        # 既にダウンロード済みの場合はスキップ（sha256サイドカーで内容を検証）
+        if (font_file_path.exists() and self._verify_font_cache(font_file_path)
+                and (expected_sha256 is None
+                     or self._font_sha256(font_file_path) == expected_sha256)):
+            if response is not None:
+                response.close()
+            logger.info("フォントファイルはダウンロード済みです: %s", font_file_path)
+            return self.set_font_file(str(font_file_path.absolute()), font_name)
+
+        # ダウンロード（1MBチャンクでストリーミング書き込み）
+        # urlretrieveは8KB単位の読み込みで、数MBのフォントでは
+        # Pythonレベルのコピー回数が無駄に多い
+        # 書き込みと同じループでSHA256も計算する（ファイルの読み直し不要）
+        #
+        # いったん<ファイル名>.partに書き、完走後にアトミックに正式名へ
+        # 置き換える。接続断で中断した場合は.partの末尾からRangeリクエスト
+        # （bytes=<取得済みサイズ>-）で再開し、取り逃した分だけを再取得する。
+        logger.info("フォントファイルをダウンロード中: %s", url)
+        part_path = font_file_path.with_suffix(font_file_path.suffix + ".part")
+        max_retries = 3
+        last_error: Optional[Exception] = None
+        for attempt in range(max_retries):
+            try:
+                resume_from = os.path.getsize(part_path) if part_path.exists() else 0
+                if resume_from and response is not None:
+                    # ヘッダー確認用の接続はRange指定なしのため再開には使えない
+                    response.close()
+                    response = None
+                if response is None:
+                    headers = dict(request_headers)
+                    if resume_from:
+                        headers["Range"] = f"bytes={resume_from}-"
+                    response = urllib.request.urlopen(
+                        urllib.request.Request(url, headers=headers),
+                        timeout=30
+                    )
+                if resume_from and response.status != 206:
+                    # サーバーがRange未対応（200で全体を返す）なら最初から書き直す
+                    resume_from = 0
+                hasher = hashlib.sha256()
+                if resume_from:
+                    # ハッシュが全体をカバーするよう取得済み部分を先に流し込む
+                    with open(part_path, "rb") as pf:
+                        for chunk in iter(lambda: pf.read(1 << 20), b""):
+                            hasher.update(chunk)
+                declared_length = response.headers.get("Content-Length")
+                received = 0
+                mode = "ab" if resume_from else "wb"
+                with response, open(part_path, mode, buffering=1 << 20) as f:
+                    while True:
+                        chunk = response.read(1 << 20)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        received += len(chunk)
+                # 接続が途中で切れた場合、read()は例外を出さず単に短く
+                # 終わるため、Content-Lengthとの突き合わせで検出する
+                if declared_length is not None and received != int(declared_length):
+                    raise ConnectionError(
+                        f"接続が途中で切断されました"
+                        f"（{received}/{declared_length}バイト受信）"
+                    )
+                response_headers = response.headers
+                break
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and cached_file is not None and cached_file.exists():
+                    # サーバー側が未更新（304）ならキャッシュをそのまま使う
+                    logger.info("フォントファイルは最新です（キャッシュを使用）: %s", cached_file)
+                    return self.set_font_file(str(cached_file.absolute()), font_name)
+                part_path.unlink(missing_ok=True)
+                raise RuntimeError(f"フォントファイルのダウンロードに失敗しました: {e}") from e
+            except (ConnectionError, TimeoutError, urllib.error.URLError) as e:
+                # 接続断・タイムアウトは.partを残したまま指数バックオフで再試行
+                last_error = e
+                response = None
+                if attempt < max_retries - 1:
+                    time.sleep(0.5 * (2 ** attempt))
+            except Exception as e:
+                part_path.unlink(missing_ok=True)
+                raise RuntimeError(f"フォントファイルのダウンロードに失敗しました: {e}") from e
+        else:
+            raise RuntimeError(
+                f"フォントファイルのダウンロードに失敗しました"
+                f"（{max_retries}回試行）: {last_error}"
+            ) from last_error
+
+        os.replace(part_path, font_file_path)
+        logger.info("フォントファイルを保存しました: %s", font_file_path)
+
+        # ダウンロード中に計算したハッシュを期待値と照合
+        digest = hasher.hexdigest()
+        if expected_sha256 is not None and digest != expected_sha256:
+            font_file_path.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"フォントファイルのSHA256が一致しません: {url}\n"
+                f"  期待値: {expected_sha256}\n"
+                f"  実際値: {digest}"
+            )
+
+        # メタデータを更新（次回の条件付きGET・ハッシュ照合用）
+        meta[url] = {
+            "filename": font_file_path.name,
+            "etag": response_headers.get("ETag", ""),
+            "last_modified": response_headers.get("Last-Modified", ""),
+            "sha256": digest,
+        }
+        self._save_font_cache_meta(fonts_path, meta)
+
+        # 次回以降のスキップ判定用にsha256サイドカーを書き出す
+        self._write_font_cache_sidecar(font_file_path, digest)
+
+        # フォントを設定
+        return self.set_font_file(str(font_file_path.absolute()), font_name)
+
+    def set_fonts_from_urls(self, urls: List[Union[str, tuple]],
+                            fonts_dir: Optional[str] = None) -> 'DocumentBuilder':
+        """
+        複数のフォントファイルを並列ダウンロード
+
+        各URLの取得をスレッドプールで並行して行うため、所要時間は
+        合計ではなく最長の1件分に近づく（Regular/Bold/Italicを
+        まとめて取得する場合など）。ドキュメントのフォントには
+        最後のURLのフォントが設定される。
+
+        Args:
+            urls: URLのリスト、または(URL, フォント名)タプルのリスト
+            fonts_dir: フォント保存先ディレクトリ（set_font_from_urlと同じ規則）
+
+        Returns:
+            self（メソッドチェーン用）
+
+        Example:
+            .set_fonts_from_urls([
+                "https://example.com/NotoSansJP-Bold.ttf",
+                ("https://example.com/NotoSansJP-Regular.ttf", "Noto Sans JP"),
+            ])
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        normalized = [
+            url if isinstance(url, tuple) else (url, None)
+            for url in urls
+        ]
+        if not normalized:
+            return self
+
+        # ダウンロード処理を使い回すため、各スレッドに使い捨てのビルダーを持たせる
+        workers = [DocumentBuilder() for _ in normalized]
+        with ThreadPoolExecutor(max_workers=min(8, len(normalized))) as executor:
+            futures = [
+                executor.submit(worker.set_font_from_url, url, name, fonts_dir)
+                for worker, (url, name) in zip(workers, normalized)
+            ]
+            for future in futures:
+                future.result()
+
+        last = workers[-1].document
+        self.document.font_file = last.font_file
+        self.document.font_name = last.font_name
         return self
 
-    def add_abstract(self, text: str, bold: bool = True, centered: bool = True):
+    @staticmethod
+    def _load_font_cache_meta(fonts_path: Path) -> Dict[str, Any]:
+        """ダウンロードキャッシュのメタデータ（.cache.json）を読み込む"""
+        import json
+        meta_file = fonts_path / ".cache.json"
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_font_cache_meta(fonts_path: Path, meta: Dict[str, Any]) -> None:
+        """メタデータをアトミックに書き出す（失敗しても動作には影響しない）"""
+        import json
+        with _FONT_META_LOCK:
+            try:
+                # 並列ダウンロード中に他スレッドが書いたエントリを失わないようマージ
+                merged = DocumentBuilder._load_font_cache_meta(fonts_path)
+                merged.update(meta)
+                meta_file = fonts_path / ".cache.json"
+                tmp = meta_file.with_suffix(".json.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                tmp.replace(meta_file)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _font_sha256(font_file_path) -> str:
+        """フォントファイルのSHA256ハッシュを計算"""
+        import hashlib
+        hasher = hashlib.sha256()
+        with open(font_file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _verify_font_cache(self, font_file_path) -> bool:
+        """
+        ダウンロード済みフォントが再利用可能か確認
+
+        sha256サイドカー（<フォント名>.sha256）が存在する場合は内容を検証し、
+        存在しない場合はファイルがあること自体を信用して再ダウンロードを省略する。
         """
-        セクション内に概要を追加
+        sidecar = font_file_path.with_suffix(font_file_path.suffix + ".sha256")
+        if not sidecar.exists():
+            return True
+        try:
+            expected = sidecar.read_text().strip()
+            return self._font_sha256(font_file_path) == expected
+        except OSError:
+            return True
+
+    def _write_font_cache_sidecar(self, font_file_path,
+                                  digest: Optional[str] = None) -> None:
+        """
+        sha256サイドカーをアトミックに書き出す（失敗しても動作には影響しない）
+
+        Args:
+            font_file_path: フォントファイルのパス
+            digest: 計算済みのSHA256（省略時はファイルを読み直して計算）
+        """
+        try:
+            sidecar = font_file_path.with_suffix(font_file_path.suffix + ".sha256")
+            tmp = sidecar.with_suffix(sidecar.suffix + ".tmp")
+            tmp.write_text(digest if digest is not None
+                           else self._font_sha256(font_file_path))
+            tmp.replace(sidecar)
+        except OSError:
+            pass
+
+    def set_margins(self, top: Optional[str] = None, bottom: Optional[str] = None,
+                    left: Optional[str] = None, right: Optional[str] = None):
+        """
+        余白を設定
+
+        Args:
+            top: 上余白（例: "2cm"）
+            bottom: 下余白（例: "2cm"）
+            left: 左余白（例: "2cm"）
+            right: 右余白（例: "2cm"）
         """
-        formatted_text = text
-        if bold:
-            formatted_text = f"\\textbf{{{formatted_text}}}"
-        if centered:
-            formatted_text = f"\\begin{{center}}\n{formatted_text}\n\\end{{center}}"
-        self.section.add(Paragraph(formatted_text))
+        if top is not None:
+            self.document.margins["top"] = top
+        if bottom is not None:
+            self.document.margins["bottom"] = bottom
+        if left is not None:
+            self.document.margins["left"] = left
+        if right is not None:
+            self.document.margins["right"] = right
         return self
-    
-    def add_blank_space(self, height: str):
+
+    def set_line_spacing(self, spacing: float):
         """
-        手書き用の空白スペースを追加
-        
+        行間を設定
+
         Args:
-            height: 空白の高さ（例: "5cm", "50mm", "10em"）
+            spacing: 行間の倍率（例: 1.5 で1.5倍の行間、2.0 で2倍の行間）
+
+        Example:
+            .set_line_spacing(1.5)  # 1.5倍の行間を設定
         """
-        self.section.add(BlankSpace(height))
+        if spacing <= 0:
+            raise ValueError("行間の倍率は0より大きい値である必要があります")
+        self.document.line_spacing = spacing
         return self
-    
-    def add_drawing_space(self, width: str = "0.7\\textwidth", 
+
+    def add_package(self, package: str, options: Optional[str] = None):
+        """パッケージを追加（同じ指定の重複追加はスキップ）"""
+        key = (package, options)
+        if key in self._added_packages:
+            return self
+        self._added_packages.add(key)
+        self.document.preamble_manager.add_package(package, options)
+        return self
+
+    def add_section(self, title: str, level: int = 1, label: Optional[str] = None, numbered: bool = False) -> 'SectionBuilder':
+        """
+        セクションを追加
+
+        Args:
+            title: セクションのタイトル
+            level: セクションのレベル（1: section, 2: subsection, ...）
+            label: 参照用のラベル
+            numbered: 番号を振るかどうか（デフォルト: False）
+        """
+        section = Section(title, level=level, label=label, numbered=numbered)
+        self.document.add(section)
+        self.current_section = section
+        return SectionBuilder(self, section)
+
+    def add_drawing_space(self, width: str = "0.7\\textwidth",
                          right_margin: str = "5cm",
                          margin_image: Optional[str] = None,
                          margin_content: Optional[Any] = None) -> 'DrawingSpaceBuilder':
         """
         手書き用の余白を確保する領域を追加
-        
+
         Args:
             width: コンテンツの幅（例: "0.7\\textwidth", "10cm"）
             right_margin: 右側の余白幅（例: "3cm", "5cm"）
             margin_image: 右側の余白に表示する画像のパス（オプション）
             margin_content: 右側の余白に表示するコンテンツ（TikZオブジェクトなど。margin_imageより優先度は低い）
-        
+
         Returns:
             DrawingSpaceBuilder（メソッドチェーン用）
+
+        Example:
+            .add_drawing_space(right_margin="5cm", margin_image="fig.png")
+                .add_paragraph("この部分だけ右側に余白（図）があります")
+                .end_drawing_space()
         """
         final_margin_content = margin_content
-        
+
         if margin_image:
             # マージン領域の幅に合わせて画像を表示
             final_margin_content = Image(margin_image, width="1.0\\linewidth", inline=True)
-            
+
         drawing_space = DrawingSpace(width=width, right_margin=right_margin, margin_content=final_margin_content)
-        self.section.add(drawing_space)
-        return DrawingSpaceBuilder(self.doc_builder, drawing_space, parent_builder=self)
-    
-    def add_exercise(self, title: str, content: str, items: Optional[List[str]] = None, columns: int = 1):
+        self.document.add(drawing_space)
+        return DrawingSpaceBuilder(self, drawing_space, parent_builder=self)
+
+    def build(self) -> Document:
+        """ドキュメントを構築"""
+        return self.document
+
+
+class SectionBuilder(_ContainerBuilderMixin):
+    """セクションを構築するビルダー"""
+
+    __slots__ = ("doc_builder", "section")
+
+    def __init__(self, doc_builder: DocumentBuilder, section: Section):
+        self.doc_builder = doc_builder
+        self.section = section
+
+    @property
+    def _container(self) -> Section:
+        return self.section
+
+    @property
+    def _root(self) -> DocumentBuilder:
+        return self.doc_builder
+
+    def add_drawing_space(self, width: str = "0.7\\textwidth",
+                         right_margin: str = "5cm",
+                         margin_image: Optional[str] = None,
+                         margin_content: Optional[Any] = None) -> 'DrawingSpaceBuilder':
         """
-        小問（練習問題）を追加
-        
+        手書き用の余白を確保する領域を追加
+
         Args:
-            title: 小問のタイトル（例: "練習4"）
-            content: 問題の本文
-            items: 小問のリスト（例: ["$f(x) = x^2$", "$f(x) = 3x + 1$"]）
-            columns: 列数（1: 縦並び, 2以上: 横並び（段組み））
-        
+            width: コンテンツの幅（例: "0.7\\textwidth", "10cm"）
+            right_margin: 右側の余白幅（例: "3cm", "5cm"）
+            margin_image: 右側の余白に表示する画像のパス（オプション）
+            margin_content: 右側の余白に表示するコンテンツ（TikZオブジェクトなど。margin_imageより優先度は低い）
+
         Returns:
-            self（メソッドチェーン用）
-        
-        Example:
-            .add_exercise("練習4", "次の関数を微分せよ。", items=["$f(x) = x^2$", "$f(x) = 3x + 1$"], columns=2)
+            DrawingSpaceBuilder（メソッドチェーン用）
         """
-        if columns > 1:
-            self.doc_builder.add_package("multicol")
-        exercise = Exercise(title=title, content=content, items=items, columns=columns)
-        self.section.add(exercise)
-        return self
-    
+        final_margin_content = margin_content
+
+        if margin_image:
+            # マージン領域の幅に合わせて画像を表示
+            final_margin_content = Image(margin_image, width="1.0\\linewidth", inline=True)
+
+        drawing_space = DrawingSpace(width=width, right_margin=right_margin, margin_content=final_margin_content)
+        self.section.add(drawing_space)
+        return DrawingSpaceBuilder(self.doc_builder, drawing_space, parent_builder=self)
+
     def end_section(self) -> DocumentBuilder:
         """セクションを終了"""
         return self.doc_builder
 
 
-class DrawingSpaceBuilder:
+class DrawingSpaceBuilder(_ContainerBuilderMixin):
     """DrawingSpaceを構築するビルダー"""
-    
-    def __init__(self, doc_builder: DocumentBuilder, drawing_space: DrawingSpace, 
+
+    __slots__ = ("doc_builder", "drawing_space", "parent_builder")
+
+    # DrawingSpace内ではfigure環境が使えないため、デフォルトでinline=True（非フロート）
+    _TIKZ_INLINE_DEFAULT = True
+
+    def __init__(self, doc_builder: DocumentBuilder, drawing_space: DrawingSpace,
                  parent_builder: Any = None):
         self.doc_builder = doc_builder
         self.drawing_space = drawing_space
         # 親ビルダー（DocumentBuilderまたはSectionBuilder）を保持
         self.parent_builder = parent_builder if parent_builder is not None else doc_builder
-    
-    def add_text(self, text: str, bold: bool = False):
-        """
-        テキストを追加
-        
-        Args:
-            text: テキスト文字列
-            bold: 太字にするかどうか（デフォルト: False）
-        """
-        self.drawing_space.add(Text(text, bold=bold))
-        return self
-    
-    def add_paragraph(self, text: str, bold: bool = False):
-        """
-        段落を追加
-        
-        Args:
-            text: 段落のテキスト
-            bold: 太字にするかどうか（デフォルト: False）
-        """
-        self.drawing_space.add(Paragraph(text, bold=bold))
-        return self
-    
-    def add_line(self, text: str, 
-                 line_style: str = "solid",
-                 line_thickness: str = "5pt",
-                 color: Optional[str] = "gray"):
-        """装飾線付きテキストを追加（例: ----解答----）"""
-        self.doc_builder._add_line_to_container(self.drawing_space, text, line_style, line_thickness,
-                                                color)
-        return self
-    
-    def add_divider(self, symbol: str = "*", spacing: str = "10em",
-                    vspace: str = "0.0em", 
-                    vspace_before: Optional[str] = None,
-                    vspace_after: Optional[str] = None):
-        """
-        軽い区切りを追加（例: *        *        *）
-        
-        Args:
-            symbol: 区切りに使用する記号（デフォルト: "*"）
-            spacing: 記号間の間隔（デフォルト: "10em"、例: "1em", "1.5em", "10em"など）
-            vspace: 上下の余白（デフォルト: "-1em"、負の値で余白を減らす）
-            vspace_before: 上の余白（指定時はvspaceより優先）
-            vspace_after: 下の余白（指定時はvspaceより優先）
-        
-        Returns:
-            self（メソッドチェーン用）
-        """
-        self.drawing_space.add(Divider(symbol=symbol, spacing=spacing, vspace=vspace, 
-                                       vspace_before=vspace_before, 
-                                       vspace_after=vspace_after))
-        return self
-    
-    def add_image(self, image_path: str, caption: Optional[str] = None,
-                  width: str = "0.8", label: Optional[str] = None):
-        """画像を追加"""
-        img = Image(image_path, caption=caption, width=width, label=label)
-        self.drawing_space.add(img)
-        return self
-    
-    def add_tikz(self, code: str, caption: Optional[str] = None, label: Optional[str] = None, 
-                 libraries: Optional[List[str]] = None, inline: bool = True):
-        """
-        TikZ図形を追加
-        
-        Note:
-            DrawingSpace内ではfigure環境が使えないため、デフォルトでinline=True（非フロート）になります。
-        """
-        self.doc_builder.add_package("tikz")
-        if libraries:
-            for lib in libraries:
-                cmd = f"\\usetikzlibrary{{{lib}}}"
-                if cmd not in self.doc_builder.document.preamble_manager.custom_commands:
-                    self.doc_builder.document.preamble_manager.add_command(cmd)
 
-        tikz = TikZ(code, caption=caption, label=label, libraries=libraries, inline=inline)
-        self.drawing_space.add(tikz)
-        return self
-    
-    def add_textbox(self, content: str, title: Optional[str] = None,
-                   box_type: str = "tcolorbox", style: Optional[Dict[str, str]] = None):
-        """テキストボックスを追加"""
-        box = TextBox(content, title=title, box_type=box_type, style=style)
-        self.drawing_space.add(box)
-        return self
-    
-    def add_note(self, content: str):
-        """注意書きを追加"""
-        self.drawing_space.add(Note(content))
-        return self
-    
-    def add_warning(self, content: str):
-        """警告を追加"""
-        self.drawing_space.add(Warning(content))
-        return self
-    
-    def add_info(self, content: str):
-        """情報を追加"""
-        self.drawing_space.add(Info(content))
-        return self
-    
-    def add_equation(self, equation: str, inline: bool = False, label: Optional[str] = None):
-        """数式を追加"""
-        eq = Equation(equation, inline=inline, label=label)
-        self.drawing_space.add(eq)
-        return self
-    
-    def add_align(self, equations: List[str], label: Optional[str] = None, numbered: bool = False, vspace: Optional[str] = None):
-        """
-        複数行の数式を追加
-        
-        Args:
-            equations: 数式のリスト
-            label: ラベル
-            numbered: 番号を振るかどうか
-            vspace: 直前の余白調整（例: "-1em", "5pt"）
-        """
-        align = Align(equations, label=label, numbered=numbered, vspace=vspace)
-        self.drawing_space.add(align)
-        return self
-    
-    def add_list(self, items: List[str], ordered: bool = False):
-        """リストを追加"""
-        lst = ListElement(items, ordered=ordered)
-        self.drawing_space.add(lst)
-        return self
-    
-    def add_table(self, headers: List[str], rows: List[List[str]],
-                  caption: Optional[str] = None, label: Optional[str] = None):
-        """テーブルを追加"""
-        table = Table(headers, rows, caption=caption, label=label)
-        self.drawing_space.add(table)
-        return self
-    
-    def add_blank_space(self, height: str):
-        """
-        手書き用の空白スペースを追加
-        
-        Args:
-            height: 空白の高さ（例: "5cm", "50mm", "10em"）
-        """
-        self.drawing_space.add(BlankSpace(height))
-        return self
-    
-    def add_exercise(self, title: str, content: str, items: Optional[List[str]] = None, columns: int = 1):
-        """
-        小問（練習問題）を追加
-        
-        Args:
-            title: 小問のタイトル（例: "練習4"）
-            content: 問題の本文
-            items: 小問のリスト（例: ["$f(x) = x^2$", "$f(x) = 3x + 1$"]）
-            columns: 列数（1: 縦並び, 2以上: 横並び（段組み））
-        
-        Returns:
-            self（メソッドチェーン用）
-        
-        Example:
-            .add_exercise("練習4", "次の関数を微分せよ。", items=["$f(x) = x^2$", "$f(x) = 3x + 1$"], columns=2)
-        """
-        if columns > 1:
-            self.doc_builder.add_package("multicol")
-        exercise = Exercise(title=title, content=content, items=items, columns=columns)
-        self.drawing_space.add(exercise)
-        return self
-    
+    @property
+    def _container(self) -> DrawingSpace:
+        return self.drawing_space
+
+    @property
+    def _root(self) -> DocumentBuilder:
+        return self.doc_builder
+
     def end_drawing_space(self):
         """DrawingSpaceを終了し、親ビルダーに戻る"""
         # parent_builderがNoneでないことを確認
         if self.parent_builder is None:
             return self.doc_builder
         return self.parent_builder
-
@@ -8,7 +8,7 @@ import time
 from pathlib import Path
 from typing import Optional, List, Tuple
 from .utils.encoding import safe_decode
-from .utils.file_utils import check_command_exists
+from .utils.file_utils import check_command_exists, stage_file
 
 
 class LaTeXCompiler:
@@ -21,24 +21,46 @@ class LaTeXCompiler:
     - エラーハンドリングとログ出力
     """
     
-    def __init__(self, engine: str = "pdflatex", 
+    # 存在確認済みエンジンのキャッシュ（全インスタンスで共有。
+    # バッチ生成でcompile()ごとのPATH探索を省く）
+    _engine_checked: set = set()
+
+    # latexmkに渡すエンジン選択オプション
+    _LATEXMK_ENGINE_OPTIONS = {
+        "pdflatex": "-pdf",
+        "xelatex": "-pdfxe",
+        "lualatex": "-pdflua",
+    }
+
+    def __init__(self, engine: str = "pdflatex",
                  compile_times: int = 2,
                  interaction_mode: str = "nonstopmode",
                  extra_options: Optional[List[str]] = None,
-                 fallback_encodings: Optional[List[str]] = None):
+                 fallback_encodings: Optional[List[str]] = None,
+                 use_latexmk: bool = False,
+                 rerun_detection: bool = True):
         """
         Args:
-            engine: LaTeXエンジン（pdflatex, xelatex, lualatex）
+            engine: LaTeXエンジン（pdflatex, xelatex, lualatex, tectonic）
             compile_times: コンパイル回数
             interaction_mode: インタラクションモード
             extra_options: 追加のLaTeXオプション
             fallback_encodings: フォールバック用エンコーディング
+            use_latexmk: Trueの場合、latexmk経由でコンパイル
+                （.aux/.tocの不動点検出により必要最小限のパス数で済む）
+            rerun_detection: Trueの場合、パス間で.auxのハッシュを比較し、
+                参照が安定していれば残りのパスを省略する
+                （latexmkの再実行ヒューリスティックの簡易版）
         """
         self.engine = engine
         self.compile_times = compile_times
         self.interaction_mode = interaction_mode
         self.extra_options = extra_options or []
         self.fallback_encodings = fallback_encodings or ['utf-8', 'cp932', 'shift_jis']
+        self.use_latexmk = use_latexmk
+        self.rerun_detection = rerun_detection
+        # フォーマット生成に失敗したプリアンブルのハッシュ（再試行を避けるため）
+        self._failed_formats: set = set()
     
     def check_dependencies(self) -> bool:
         """
@@ -50,24 +72,108 @@ class LaTeXCompiler:
         Raises:
             FileNotFoundError: コマンドが見つからない場合
         """
+        if self.engine in LaTeXCompiler._engine_checked:
+            return True
         if not check_command_exists(self.engine):
             raise FileNotFoundError(
                 f"'{self.engine}'コマンドが見つかりません。\n"
                 f"  -> TeX Live/MiKTeXがインストールされ、PATHに追加されているか確認してください。"
             )
+        LaTeXCompiler._engine_checked.add(self.engine)
         return True
     
-    def compile(self, tex_file: str, output_dir: Optional[str] = None) -> Tuple[bool, str]:
+    def precompile_format(self, preamble: str, cache_dir: str,
+                          encoding: str = "utf-8") -> Optional[str]:
+        """
+        プリアンブルを.fmtフォーマットファイルに事前コンパイル
+
+        同じプリアンブルを繰り返しコンパイルする場合に、パッケージの解析を
+        省略できるよう、プリアンブルのハッシュをキーに.fmtファイルをキャッシュする。
+
+        Args:
+            preamble: \\documentclassから\\begin{document}直前までのLaTeXコード
+            cache_dir: .fmtファイルのキャッシュディレクトリ
+            encoding: プリアンブル書き出し時のエンコーディング
+
+        Returns:
+            生成された.fmtファイルのパス（生成できない場合はNone）
+        """
+        import hashlib
+
+        # Tectonicは-iniモードをサポートしない（内部キャッシュで代替される）
+        if self.engine == "tectonic":
+            return None
+
+        cache_path = Path(cache_dir)
+        digest = hashlib.sha256(
+            f"{self.engine}\n{preamble}".encode("utf-8")
+        ).hexdigest()[:16]
+        fmt_file = cache_path / f"{digest}.fmt"
+
+        if fmt_file.exists():
+            return str(fmt_file)
+        if digest in self._failed_formats:
+            return None
+
+        try:
+            self.check_dependencies()
+        except FileNotFoundError:
+            return None
+
+        cache_path.mkdir(parents=True, exist_ok=True)
+        ini_file = cache_path / f"{digest}.tex"
+        with open(ini_file, "w", encoding=encoding) as f:
+            f.write(preamble)
+            f.write("\\dump\n")
+
+        # -iniモードでプリアンブルを読み込み、\dumpで.fmtを書き出す
+        cmd = [
+            self.engine,
+            "-ini",
+            f"-interaction={self.interaction_mode}",
+            f"-jobname={digest}",
+            f"&{self.engine}",
+            ini_file.name
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=str(cache_path),
+                capture_output=True,
+                check=False,
+                timeout=60
+            )
+        except Exception:
+            self._failed_formats.add(digest)
+            return None
+
+        if result.returncode == 0 and fmt_file.exists():
+            return str(fmt_file)
+
+        # 失敗した場合は記録して通常コンパイルにフォールバック
+        self._failed_formats.add(digest)
+        return None
+
+    def compile(self, tex_file: str, output_dir: Optional[str] = None,
+                format_file: Optional[str] = None,
+                draft: bool = False, draft_only: bool = False) -> Tuple[bool, str]:
         """
         PDFをコンパイル
-        
+
         Args:
             tex_file: コンパイルする.texファイルのパス
             output_dir: 出力ディレクトリ（Noneの場合はtex_fileと同じディレクトリ）
-        
+            format_file: 事前コンパイル済みフォーマット（.fmt）のパス
+                （指定時は-fmt=オプションでプリアンブルの再解析をスキップ）
+            draft: Trueの場合、最終パス以外を-draftmodeで実行
+                （画像の描画やPDF出力を省略して参照解決のみ行う）
+            draft_only: Trueの場合、すべてのパスを-draftmodeで実行
+                （ページレイアウトの検証用。PDFは生成されない）
+
         Returns:
             Tuple[bool, str]: (成功フラグ, エラーメッセージ)
-        
+
         Raises:
             FileNotFoundError: tex_fileが見つからない場合
             RuntimeError: コンパイルエラー時
@@ -77,60 +183,170 @@ class LaTeXCompiler:
             raise FileNotFoundError(f"LaTeXファイルが見つかりません: {tex_file}")
         
         # 出力ディレクトリの設定
+        # tex_fileはコピーせず絶対パスのまま読ませる。work_dirと異なる場合は
+        # -output-directoryで成果物だけをwork_dirに書かせる（cwdはwork_dirの
+        # ままなので、fonts/等の相対パス資源は従来どおりwork_dir基準で解決される）
         if output_dir:
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
             work_dir = output_path
-            # tex_fileをwork_dirにコピー（または同じディレクトリの場合はそのまま）
-            if tex_path.parent != work_dir:
-                import shutil
-                target_tex = work_dir / tex_path.name
-                shutil.copy2(tex_path, target_tex)
-                tex_file_to_compile = target_tex
-            else:
-                tex_file_to_compile = tex_path
         else:
             work_dir = tex_path.parent
-            tex_file_to_compile = tex_path
         
         # 依存関係の確認
         self.check_dependencies()
-        
+
         # コンパイルコマンドの構築
-        cmd = [
-            self.engine,
-            f'-interaction={self.interaction_mode}',
-            *self.extra_options,
-            str(tex_file_to_compile.name)
-        ]
-        
+        if (self.use_latexmk and not draft_only
+                and self.engine in self._LATEXMK_ENGINE_OPTIONS
+                and check_command_exists("latexmk")):
+            # latexmkは.aux/.tocが安定するまで必要な回数だけパスを実行する
+            # （固定回数のパスと違い、不要な2回目や不足する3回目が起きない）
+            cmd = [
+                "latexmk",
+                self._LATEXMK_ENGINE_OPTIONS[self.engine],
+                f'-interaction={self.interaction_mode}',
+                '-halt-on-error',
+                '-silent',
+                f'-output-directory={work_dir}',
+                str(tex_path)
+            ]
+            compile_times = 1
+            draft = False
+        elif self.engine == "tectonic":
+            # Tectonicは1回の起動で必要なパスを内部的に繰り返し、
+            # パッケージ・フォント情報を~/.cache/Tectonic/にキャッシュする
+            cmd = [
+                "tectonic",
+                "-X", "compile",
+                "--keep-intermediates",
+                "--outdir", str(work_dir),
+                str(tex_path)
+            ]
+            compile_times = 1
+        else:
+            format_options = []
+            if format_file:
+                # .fmtファイルを作業ディレクトリに配置して-fmt=で読み込む
+                fmt_path = Path(format_file)
+                target_fmt = work_dir / fmt_path.name
+                if fmt_path.exists() and not target_fmt.exists():
+                    stage_file(fmt_path, target_fmt)
+                format_options.append(f'-fmt={fmt_path.stem}')
+
+            output_options = []
+            if tex_path.parent != work_dir:
+                output_options.append(f'-output-directory={work_dir}')
+
+            cmd = [
+                self.engine,
+                f'-interaction={self.interaction_mode}',
+                *output_options,
+                *format_options,
+                *self.extra_options,
+                str(tex_path)
+            ]
+            compile_times = self.compile_times
+
+        # ループ不変の値はパスごとに計算し直さない
+        cmd = tuple(cmd)
+        work_dir_str = os.fspath(work_dir)
+        stem = tex_path.stem
+
         errors = []
-        
+
+        # batchmodeではログ出力の転送・デコードを省略し、エラー時のみ.logを参照する
+        # （小さいドキュメントではログI/Oがコンパイル時間の無視できない割合を占める）
+        quiet = (self.interaction_mode == "batchmode"
+                 and self.engine != "tectonic")
+
+        # 再実行判定用: パスの前後で.auxが変化しなければ参照は安定しており、
+        # 残りのパスは同じ結果を生むだけなので省略できる
+        aux_file = work_dir / f"{stem}.aux"
+        prev_aux_digest = self._aux_digest(aux_file)
+        skip_to_last = False
+
         # 指定回数コンパイル
-        for i in range(self.compile_times):
+        for i in range(compile_times):
+            is_last_pass = (i == compile_times - 1)
+            if skip_to_last and not is_last_pass:
+                # 参照が安定済み: 最終パス（PDF出力）だけ実行する
+                continue
+            # ドラフトモード: 最終パス以外（draft）またはすべてのパス（draft_only）
+            # （Tectonicはドラフトモードをサポートしない）
+            pass_cmd = list(cmd)
+            is_draft_pass = ((draft_only or (draft and not is_last_pass))
+                             and self.engine != "tectonic")
+            if is_draft_pass:
+                pass_cmd.insert(1, '-draftmode')
+            if (quiet or is_draft_pass) and pass_cmd[0] != "latexmk":
+                # ドラフトパスが失敗した場合に後続パスを無駄にしないよう、
+                # エラー時は即座に停止させる
+                pass_cmd.insert(1, '-halt-on-error')
+
+            # close_fds=FalseでfdスキャンをスキップするLinuxの
+            # spawnコストを削る（渡すfdは標準入出力のみで継承の害はない）
             try:
-                result = subprocess.run(
-                    cmd,
-                    cwd=str(work_dir),
-                    capture_output=True,
-                    check=False,
-                    timeout=60  # タイムアウト60秒
-                )
-                
-                # 出力をデコード
-                stdout = safe_decode(result.stdout, self.fallback_encodings)
-                stderr = safe_decode(result.stderr, self.fallback_encodings)
-                
+                if quiet:
+                    result = subprocess.run(
+                        pass_cmd,
+                        cwd=work_dir_str,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        check=False,
+                        close_fds=False,
+                        timeout=60  # タイムアウト60秒
+                    )
+                else:
+                    # 出力はパイプに溜めず直接ファイルへ書かせる
+                    # （capture_outputは数MBになり得るログを毎パス丸ごと
+                    # Python側のbytesに取り込んでしまう。エラー時に末尾を
+                    # 読むだけなので、ファイル経由の方が割り当ても転送も少ない）
+                    output_log = work_dir / f"{stem}.compile.log"
+                    with open(output_log, "wb") as log_f:
+                        result = subprocess.run(
+                            pass_cmd,
+                            cwd=work_dir_str,
+                            stdout=log_f,
+                            stderr=subprocess.STDOUT,
+                            check=False,
+                            close_fds=False,
+                            timeout=60  # タイムアウト60秒
+                        )
+
                 # エラーの記録
                 if result.returncode != 0:
                     error_msg = f"{i+1}回目のコンパイルでエラーが発生しました:\n"
-                    if stderr:
-                        error_msg += f"stderr: {stderr}\n"
-                    if stdout:
-                        # LaTeXのエラーメッセージは通常stdoutに出力される
-                        error_msg += f"stdout: {stdout[-2000:]}\n"  # 最後の2000文字
+                    if quiet:
+                        # 出力は破棄しているため、.logファイルの末尾から取得
+                        log_tail = self._read_log_tail(
+                            work_dir / f"{stem}.log"
+                        )
+                        if log_tail:
+                            error_msg += f"log: {log_tail}\n"
+                    else:
+                        # LaTeXのエラーメッセージは通常stdout側に出力される
+                        log_tail = self._read_log_tail(output_log)
+                        if log_tail:
+                            error_msg += f"output: {log_tail}\n"
                     errors.append(error_msg)
-                
+                    # ドラフトパスで失敗した場合、残りのパスは同じエラーを
+                    # 繰り返すだけなので打ち切る
+                    if is_draft_pass:
+                        break
+                elif self.rerun_detection and not is_last_pass:
+                    # パス成功後に.auxを照合し、変化がなければ参照は収束済み
+                    new_digest = self._aux_digest(aux_file)
+                    if new_digest is not None and new_digest == prev_aux_digest:
+                        if is_draft_pass:
+                            # ドラフトパスはPDFを出力しないため、
+                            # 中間パスを飛ばして最終パスのみ実行する
+                            skip_to_last = True
+                        else:
+                            # このパスのPDFが最終成果物になる
+                            break
+                    prev_aux_digest = new_digest
+
             except subprocess.TimeoutExpired:
                 raise RuntimeError(
                     f"コンパイルがタイムアウトしました（60秒）。"
@@ -139,13 +355,22 @@ class LaTeXCompiler:
             except Exception as e:
                 raise RuntimeError(f"コンパイル中に予期しないエラーが発生しました: {e}") from e
         
+        # 転送用ログは残さない（エラー詳細はerrorsに取り込み済み）
+        if not quiet:
+            (work_dir / f"{stem}.compile.log").unlink(missing_ok=True)
+
+        # draft_onlyの場合はPDFを生成しないため、エラーの有無のみ返す
+        if draft_only:
+            return (not errors), "\n".join(errors) if errors else ""
+
         # PDFファイルが作成されたか確認
-        pdf_file = work_dir / f"{tex_file_to_compile.stem}.pdf"
-        if not pdf_file.exists():
-            # 別の場所を確認（元のtex_fileと同じディレクトリ）
-            pdf_file = tex_path.with_suffix('.pdf')
-        
-        if not pdf_file.exists():
+        # （PDFは常にwork_dir直下に生成される。output_dir未指定時は
+        # work_dir == tex_path.parentなので、元ディレクトリを別途
+        # 探し直す必要はなく、statは1回で済む）
+        pdf_file = work_dir / f"{stem}.pdf"
+        try:
+            os.stat(pdf_file)
+        except FileNotFoundError:
             error_summary = "\n".join(errors) if errors else "不明なエラー"
             raise RuntimeError(
                 f"PDFファイルが作成されませんでした。\n"
@@ -156,7 +381,47 @@ class LaTeXCompiler:
         # エラーメッセージは警告として返す
         return True, "\n".join(errors) if errors else ""
     
-    def cleanup(self, tex_file: str, extensions: List[str], 
+    @staticmethod
+    def _aux_digest(aux_file: Path) -> Optional[bytes]:
+        """
+        .auxファイルの内容ハッシュを計算（再実行判定用）
+
+        Args:
+            aux_file: .auxファイルのパス
+
+        Returns:
+            ハッシュ値（ファイルが存在しない場合はNone）
+        """
+        import hashlib
+        try:
+            data = aux_file.read_bytes()
+        except OSError:
+            return None
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _read_log_tail(self, log_file: Path, max_chars: int = 2000) -> str:
+        """
+        コンパイルログの末尾を読み取る（batchmodeでのエラー報告用）
+
+        Args:
+            log_file: .logファイルのパス
+            max_chars: 読み取る最大文字数
+
+        Returns:
+            ログ末尾の文字列（ログが存在しない場合は空文字列）
+        """
+        try:
+            with open(log_file, "rb") as f:
+                # 末尾だけseekして読む（数MBのログを丸ごと読み込まない）
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - max_chars * 4))
+                data = f.read()
+        except OSError:
+            return ""
+        return safe_decode(data, self.fallback_encodings)[-max_chars:]
+
+    def cleanup(self, tex_file: str, extensions: List[str],
                 output_dir: Optional[str] = None) -> None:
         """
         中間ファイルを削除
@@ -174,13 +439,27 @@ class LaTeXCompiler:
         else:
             work_dir = tex_path.parent
         
-        time.sleep(0.5)  # ファイルが完全に閉じられるまで少し待つ
-        
-        for ext in extensions:
-            temp_file = work_dir / f"{base_name}{ext}"
-            if temp_file.exists():
+        # ディレクトリを1回走査して削除対象だけをunlinkする
+        # （拡張子ごとにunlinkを発行すると、存在しないファイルの分まで
+        # ENOENTのシステムコールを払う。scandir1回+実在ファイル分のunlinkで済む）
+        target_names = {f"{base_name}{ext}" for ext in extensions}
+        try:
+            entries = [e.path for e in os.scandir(work_dir)
+                       if e.name in target_names]
+        except OSError:
+            return
+
+        # 事前の一律スリープはせず、削除に失敗した場合のみ待って再試行する
+        # （ファイルが既に閉じられている通常ケースでは待ち時間ゼロ。
+        # Windows等でハンドルが残っている場合のみ指数バックオフで最大約1.5秒待つ）
+        for target in entries:
+            for attempt in range(5):
                 try:
-                    temp_file.unlink()
-                except (PermissionError, FileNotFoundError):
-                    # ファイルが使用中または既に削除されている場合はスキップ
-                    pass
+                    os.unlink(target)
+                    break
+                except FileNotFoundError:
+                    break
+                except PermissionError:
+                    # ファイルが使用中: バックオフして再試行（最終的には諦める）
+                    if attempt < 4:
+                        time.sleep(0.05 * (1 << attempt))
@@ -2,13 +2,36 @@
 設定ファイルの読み込み、検証、管理を担当するモジュール
 """
 
+import copy
+import functools
 import json
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from jsonschema import validate, ValidationError, SchemaError
+from jsonschema import Draft7Validator, ValidationError, SchemaError
 from jsonschema.exceptions import best_match
 
+try:
+    # orjsonが利用可能な場合は使用（stdlib jsonの3〜5倍高速）
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@functools.lru_cache(maxsize=16)
+def _load_json_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    JSONファイルを読み込む（(パス, 更新時刻)をキーにキャッシュ）
+
+    同一プロセス内で複数のConfigManagerを作るバッチ生成では、
+    2回目以降のパースがキャッシュヒットになる。ファイルが更新されると
+    mtime_nsが変わるため自動的に再読み込みされる。
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class ConfigManager:
     """
@@ -66,6 +89,10 @@ class ConfigManager:
         
         self.config: Dict[str, Any] = {}
         self.schema: Dict[str, Any] = {}
+        # ドット記法キー -> 値の平坦化マップ（get()が初回に構築）
+        self._flat_config: Optional[Dict[str, Any]] = None
+        # コンパイル済みバリデータ（load_schema()が構築して使い回す）
+        self._validator: Optional[Draft7Validator] = None
         
     def load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込む"""
@@ -74,9 +101,13 @@ class ConfigManager:
                 f"設定ファイルが見つかりません: {self.config_path}"
             )
         
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self.config = json.load(f)
-        
+        # 呼び出し側が設定を書き換えてもキャッシュを汚さないようコピーを持つ
+        cached = _load_json_cached(
+            str(self.config_path), self.config_path.stat().st_mtime_ns
+        )
+        self.config = copy.deepcopy(cached)
+        self._flat_config = None
+
         return self.config
     
     def load_schema(self) -> Dict[str, Any]:
@@ -86,9 +117,17 @@ class ConfigManager:
                 f"スキーマファイルが見つかりません: {self.schema_path}"
             )
         
-        with open(self.schema_path, "r", encoding="utf-8") as f:
-            self.schema = json.load(f)
-        
+        # スキーマは読み取り専用なのでキャッシュをそのまま共有する
+        self.schema = _load_json_cached(
+            str(self.schema_path), self.schema_path.stat().st_mtime_ns
+        )
+
+        # バリデータを一度だけコンパイルして使い回す
+        # （jsonschema.validate()は呼び出しごとにスキーマの検査と
+        # バリデータ構築をやり直すため、検証のたびに固定費がかかる）
+        Draft7Validator.check_schema(self.schema)
+        self._validator = Draft7Validator(self.schema)
+
         return self.schema
     
     def validate_config(self, config: Optional[Dict[str, Any]] = None) -> bool:
@@ -112,16 +151,21 @@ class ConfigManager:
         if not self.schema_path.exists():
             return True
         
-        if not self.schema:
+        if self._validator is None:
             try:
                 self.load_schema()
             except FileNotFoundError:
                 # スキーマファイルが見つからない場合はスキップ
                 return True
-        
+            except SchemaError as e:
+                raise SchemaError(f"スキーマファイルのエラー: {e.message}") from e
+
         try:
-            validate(instance=config, schema=self.schema)
-            return True
+            errors = sorted(self._validator.iter_errors(config),
+                            key=lambda err: list(err.absolute_path))
+            if not errors:
+                return True
+            raise errors[0]
         except ValidationError as e:
             # より詳細なエラーメッセージを提供
             best_error = best_match([e])
@@ -145,17 +189,32 @@ class ConfigManager:
         
         Returns:
             設定値
+
+        Note:
+            初回呼び出し時に設定全体をドット記法キーの平坦マップに展開し、
+            以降はO(1)の辞書引きで返す（生成処理中はgetが数十回呼ばれ、
+            毎回のstr.splitと階層たどりが無駄になるため）。self.configを
+            直接書き換えた場合はload_config()で読み直すこと。
         """
-        keys = key_path.split(".")
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        if self._flat_config is None:
+            self._flat_config = self._flatten(self.config)
+        return self._flat_config.get(key_path, default)
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+        """設定をドット記法キーの平坦マップに展開（中間ノードの辞書も含む）"""
+        flat: Dict[str, Any] = {}
+        stack = [("", config)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                path = f"{prefix}{key}"
+                # 中間ノードも登録する（get("templates.report")のように
+                # サブツリーごと取得する呼び出しがあるため）
+                flat[path] = value
+                if isinstance(value, dict):
+                    stack.append((f"{path}.", value))
+        return flat
     
     def merge(self, override_config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -167,16 +226,19 @@ class ConfigManager:
         Returns:
             マージされた設定辞書
         """
-        def deep_merge(base: Dict, override: Dict) -> Dict:
-            result = base.copy()
+        # 先頭でまとめて1回だけコピーし、以降はスタックでたどりながら
+        # その場で上書きする（再帰+階層ごとの.copy()だとノード数×深さ分の
+        # コピーが発生する。self.config自体は変更しない）
+        result = copy.deepcopy(self.config)
+        stack = [(result, override_config)]
+        while stack:
+            base, override = stack.pop()
             for key, value in override.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = deep_merge(result[key], value)
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    stack.append((base[key], value))
                 else:
-                    result[key] = value
-            return result
-        
-        return deep_merge(self.config, override_config)
+                    base[key] = value
+        return result
     
     def validate_template_config(self, template_name: str, 
                                  variables: Dict[str, Any]) -> bool:
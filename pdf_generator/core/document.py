@@ -2,16 +2,26 @@
 ドキュメント全体を管理するクラス
 """
 
-from typing import List, Optional, Dict
+import os
+from typing import List, Optional, Dict, TYPE_CHECKING
 from pathlib import Path
 from ..elements.base import LaTeXElement
 from ..renderer.latex_renderer import LaTeXRenderer
 from ..renderer.preamble import PreambleManager
 
+if TYPE_CHECKING:
+    from ..elements.graphics import Image
+
 
 class Document:
     """LaTeXドキュメント全体を表現するクラス"""
-    
+
+    # LaTeXRendererはインスタンス状態を持たないため全ドキュメントで共有する
+    # （バッチ生成でドキュメントごとに作り直す意味がない。PreambleManagerは
+    # パッケージやカスタムコマンドをドキュメント単位で蓄積するので共有不可）
+    _shared_renderer = LaTeXRenderer()
+
+
     def __init__(self, title: Optional[str], author: str, date: Optional[str] = None,
                  font: str = "min", margins: Optional[Dict[str, str]] = None,
                  font_file: Optional[str] = None, font_name: Optional[str] = None,
@@ -43,12 +53,17 @@ class Document:
         
         self.preamble_manager = PreambleManager()
         self.content: List[LaTeXElement] = []
-        self.renderer = LaTeXRenderer()
+        self.renderer = Document._shared_renderer
     
     def add(self, element: LaTeXElement):
         """要素を追加"""
         self.content.append(element)
         return self
+
+    def add_many(self, elements: List[LaTeXElement]):
+        """複数の要素を一括追加"""
+        self.content.extend(elements)
+        return self
     
     def to_latex(self) -> str:
         """LaTeXコードに変換"""
@@ -57,17 +72,48 @@ class Document:
     def process_images(self, output_dir: Path) -> dict:
         """
         画像などのリソースを処理
-        
+
         Args:
             output_dir: 出力ディレクトリ
-        
+
         Returns:
             リソースのパスマッピング
         """
+        # 画像要素をツリーから集め、コピーをスレッドプールで並列化する
+        # （sendfileはGILを解放するため、画像が多いドキュメントでは
+        # 直列のsyscall待ちがほぼ並列化される）
+        images = self._collect_images()
+        if len(images) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            result = {}
+            with ThreadPoolExecutor(max_workers=min(8, len(images))) as pool:
+                for mapping in pool.map(
+                        lambda e: e.process_resources(output_dir), images):
+                    result.update(mapping)
+            return result
+
+        # 画像が0〜1枚なら直列で処理する。どちらの経路も_collect_imagesの
+        # 結果だけを使うため、テキストだけのサブツリーでprocess_resourcesの
+        # 再帰と空dictのマージが走ることはない
         result = {}
-        for element in self.content:
-            result.update(element.process_resources(output_dir))
+        for image in images:
+            result.update(image.process_resources(output_dir))
         return result
+
+    def _collect_images(self) -> List["Image"]:
+        """ツリーを1回走査してImage要素（margin_content内も含む）を集める"""
+        from ..elements.graphics import Image
+        images: List[Image] = []
+        stack: List[LaTeXElement] = list(self.content)
+        while stack:
+            element = stack.pop()
+            if isinstance(element, Image):
+                images.append(element)
+            margin = getattr(element, "margin_content", None)
+            if isinstance(margin, LaTeXElement):
+                stack.append(margin)
+            stack.extend(element.children)
+        return images
     
     def process_fonts(self, output_dir: Path) -> Optional[str]:
         """
@@ -81,8 +127,8 @@ class Document:
         """
         if not self.font_file:
             return None
-        
-        import shutil
+
+        from ..utils.file_utils import stage_file
         font_path = Path(self.font_file)
         if not font_path.exists():
             raise FileNotFoundError(f"フォントファイルが見つかりません: {self.font_file}")
@@ -91,48 +137,53 @@ class Document:
         fonts_dir.mkdir(parents=True, exist_ok=True)
         
         dest_path = fonts_dir / font_path.name
-        shutil.copy2(font_path, dest_path)
+        # 同一ファイルシステムならハードリンクで数十MBのコピーを省略
+        stage_file(font_path, dest_path)
         
         # 太字フォントを自動検出してコピー
         font_stem = font_path.stem
         font_parent = font_path.parent
         
         # 一般的な太字フォント名のパターンをチェック
-        bold_patterns = [
+        # （dict.fromkeysで挿入順を保ったまま重複を除去。stemにRegularが
+        # 含まれない場合、replaceの無変化分はここで1つに畳まれる）
+        bold_patterns = dict.fromkeys((
             font_stem.replace("Regular", "Bold"),
             font_stem.replace("-Regular", "-Bold"),
             font_stem.replace("_Regular", "_Bold"),
             font_stem + "Bold",
             font_stem + "-Bold",
             font_stem + "_Bold",
-        ]
-        
-        # 既存のパターンから重複を除去
-        bold_patterns = list(dict.fromkeys(bold_patterns))
-        
-        bold_font_copied = False
+        ))
+
+        # ディレクトリを1回だけ走査し、以降は辞書引きで判定する
+        # （パターンごとのexists()や拡張子別のglob()はそれぞれstatを
+        # 伴うため、フォントが多いディレクトリでは走査1回の方が速い）
+        try:
+            entries = {e.name for e in os.scandir(font_parent) if e.is_file()}
+        except OSError:
+            entries = set()
+
+        bold_font_name = None
         for pattern in bold_patterns:
-            bold_font_path = font_parent / f"{pattern}{font_path.suffix}"
-            if bold_font_path.exists():
-                bold_dest_path = fonts_dir / bold_font_path.name
-                shutil.copy2(bold_font_path, bold_dest_path)
-                bold_font_copied = True
+            candidate = f"{pattern}{font_path.suffix}"
+            if candidate in entries:
+                bold_font_name = candidate
                 break
-        
-        # 太字フォントが見つからない場合、同じディレクトリ内の他の太字フォントを検索
-        if not bold_font_copied:
-            for bold_file in font_parent.glob("*Bold*.ttf"):
-                if bold_file.exists():
-                    bold_dest_path = fonts_dir / bold_file.name
-                    shutil.copy2(bold_file, bold_dest_path)
-                    bold_font_copied = True
-                    break
-            if not bold_font_copied:
-                for bold_file in font_parent.glob("*Bold*.otf"):
-                    if bold_file.exists():
-                        bold_dest_path = fonts_dir / bold_file.name
-                        shutil.copy2(bold_file, bold_dest_path)
+
+        # パターンで見つからない場合、同じディレクトリ内の他の太字フォントを検索
+        # （従来のglob("*Bold*.ttf") → glob("*Bold*.otf")と同じ優先順）
+        if bold_font_name is None:
+            for suffix in (".ttf", ".otf"):
+                for name in sorted(entries):
+                    if "Bold" in name and name.endswith(suffix):
+                        bold_font_name = name
                         break
+                if bold_font_name is not None:
+                    break
+
+        if bold_font_name is not None:
+            stage_file(font_parent / bold_font_name, fonts_dir / bold_font_name)
         
         # 相対パスを保存（LaTeXで使用するため）
         self.font_file = str(dest_path.absolute())
@@ -2,8 +2,10 @@
 PDF生成のメインクラス
 """
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from .document import Document
 from ..compiler import LaTeXCompiler
 from ..config import ConfigManager
@@ -11,7 +13,11 @@ from ..config import ConfigManager
 
 class PDFGenerator:
     """PDF生成のメインクラス"""
-    
+
+    # 再コンパイルの高速化のために実行間で保持する中間ファイルの拡張子
+    _PERSISTENT_AUX_EXTENSIONS = ('.aux', '.toc', '.out', '.fls', '.fdb_latexmk')
+
+
     def __init__(self, config_path: Optional[str] = None):
         """
         Args:
@@ -24,12 +30,19 @@ class PDFGenerator:
             compile_times=self.config_manager.get("compilation.compile_times", 2),
             interaction_mode=self.config_manager.get("compilation.interaction_mode", "nonstopmode"),
             extra_options=self.config_manager.get("compilation.extra_options", []),
-            fallback_encodings=self.config_manager.get("encoding.fallback_encodings", ['utf-8', 'cp932'])
+            fallback_encodings=self.config_manager.get("encoding.fallback_encodings", ['utf-8', 'cp932']),
+            use_latexmk=self.config_manager.get("compilation.use_latexmk", False),
+            rerun_detection=self.config_manager.get("compilation.rerun_detection", True)
         )
         
+        # 非同期生成用（generate_async/generate_many）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._thread_local = threading.local()
+
         # ディレクトリの作成
         self._ensure_directories()
-    
+
     def _ensure_directories(self):
         """必要なディレクトリを作成"""
         output_dir = self.config_manager.get("directories.output_dir", "output")
@@ -39,26 +52,251 @@ class PDFGenerator:
         if temp_dir:
             Path(temp_dir).mkdir(parents=True, exist_ok=True)
     
-    def generate(self, document: Document, output_name: Optional[str] = None) -> str:
+    def _local_compiler(self) -> LaTeXCompiler:
+        """
+        現在のスレッド用のLaTeXCompilerを返す
+
+        generate()はフォント指定時にエンジンを一時的に切り替えるため、
+        generate_async/generate_manyで並列実行する際はスレッドごとに
+        コンパイラーを分けて競合を防ぐ。メインスレッドでは共有の
+        self.compilerをそのまま使用する。
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.compiler
+
+        compiler = getattr(self._thread_local, "compiler", None)
+        if compiler is None:
+            compiler = LaTeXCompiler(
+                engine=self.compiler.engine,
+                compile_times=self.compiler.compile_times,
+                interaction_mode=self.compiler.interaction_mode,
+                extra_options=list(self.compiler.extra_options),
+                fallback_encodings=list(self.compiler.fallback_encodings),
+                use_latexmk=self.compiler.use_latexmk,
+                rerun_detection=self.compiler.rerun_detection
+            )
+            self._thread_local.compiler = compiler
+        return compiler
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """非同期生成用のスレッドプールを作成（初回のみ）"""
+        with self._executor_lock:
+            if self._executor is None:
+                import os
+                max_workers = self.config_manager.get(
+                    "batch.max_workers", min(os.cpu_count() or 1, 4)
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="pdf-generator"
+                )
+            return self._executor
+
+    def _document_cache_key(self, latex_content: str,
+                            font_file: Optional[str],
+                            resource_paths=()) -> str:
+        """
+        ドキュメント内容からPDFキャッシュ用のキーを計算
+
+        LaTeXコード全体・フォントファイルの内容・エンジン名に加え、
+        画像などのリソースファイルの(パス, サイズ, 更新時刻)を
+        ハッシュ化する。画像が差し替えられるとLaTeXコードが同一でも
+        キーが変わり、古いPDFが再利用されない。
+
+        Args:
+            latex_content: ドキュメント全体のLaTeXコード
+            font_file: フォントファイルのパス（Noneの場合は無視）
+            resource_paths: 画像等のリソースファイルの元パスの集まり
+                （process_resourcesで存在確認済みであること）
+
+        Returns:
+            キャッシュキー（16進数文字列）
+        """
+        import hashlib
+        import os
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(self._local_compiler().engine.encode("utf-8"))
+        hasher.update(latex_content.encode("utf-8"))
+        if font_file and Path(font_file).exists():
+            with open(font_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(chunk)
+        # リソースは内容ではなくstat情報で判定（数MBの画像を読み直さない）。
+        # statに失敗したリソースを黙って飛ばすと鮮度判定がキーに入らず
+        # 古いPDFを返してしまうため、ここではそのまま送出する
+        for path in sorted(str(p) for p in resource_paths):
+            st = os.stat(path)
+            hasher.update(
+                f"{path}\x00{st.st_size}\x00{st.st_mtime_ns}".encode("utf-8")
+            )
+        return hasher.hexdigest()
+
+    def _precompile_preamble(self, latex_content: str, encoding: str):
+        """
+        LaTeXコードのプリアンブル部分を.fmtファイルに事前コンパイル
+
+        Args:
+            latex_content: ドキュメント全体のLaTeXコード
+            encoding: プリアンブル書き出し時のエンコーディング
+
+        Returns:
+            Tuple[Optional[str], str]: (.fmtファイルのパスまたはNone, 本文のLaTeXコード)
+        """
+        marker = "\\begin{document}"
+        index = latex_content.find(marker)
+        if index == -1:
+            return None, latex_content
+
+        preamble = latex_content[:index]
+        body = latex_content[index:]
+
+        cache_dir = self.config_manager.get(
+            "directories.format_cache_dir",
+            str(Path.home() / ".cache" / "math-textbook" / "fmt")
+        )
+        format_file = self._local_compiler().precompile_format(preamble, cache_dir,
+                                                               encoding=encoding)
+        return format_file, body
+
+    def _subset_document_fonts(self, document: Document) -> None:
+        """
+        ドキュメントのフォントを使用文字のみのサブセットに差し替え
+
+        fontToolsが利用できない場合やサブセット生成に失敗した場合は
+        何もせず、元のフォントがそのまま使われる。太字フォントも
+        process_fonts()の自動検出パターンに合う名前でサブセット化する。
+
+        Args:
+            document: Documentインスタンス（font_fileが設定されていること）
+        """
+        from ..utils.font_subset import subset_font
+
+        original = Path(document.font_file)
+        cache_dir = self.config_manager.get(
+            "directories.subset_cache_dir",
+            str(Path.home() / ".cache" / "math-textbook" / "subset")
+        )
+
+        # 使用コードポイントの抽出にはドキュメント全体のLaTeXコードを使う
+        text = document.to_latex()
+        subset_path = subset_font(str(original), text, cache_dir)
+        if subset_path is None:
+            return
+
+        # 太字フォントも同じディレクトリにサブセット化して自動検出を維持
+        new_stem = Path(subset_path).stem
+        bold_stem = new_stem.replace("Regular", "Bold")
+        if bold_stem != new_stem:
+            bold_original = Path(str(original).replace("Regular", "Bold"))
+            if not bold_original.exists():
+                bold_original = next(
+                    iter(original.parent.glob(f"*Bold*{original.suffix}")), None
+                )
+            if bold_original is not None and bold_original.exists():
+                subset_font(str(bold_original), text, cache_dir,
+                            output_stem=bold_stem)
+
+        document.font_file = subset_path
+
+    def clean(self) -> None:
+        """
+        実行間で保持している中間ファイル（.aux/.toc等）を削除
+
+        keep_aux設定（デフォルト: 有効）により残された参照解決用の
+        中間ファイルを、出力・一時ディレクトリから取り除く。
+        """
+        output_dir = Path(self.config_manager.get("directories.output_dir", "output"))
+        temp_dir = Path(self.config_manager.get("directories.temp_dir", output_dir))
+
+        for directory in {output_dir, temp_dir}:
+            if not directory.exists():
+                continue
+            for ext in self._PERSISTENT_AUX_EXTENSIONS + ('.log', '.synctex.gz'):
+                for aux_file in directory.glob(f"*{ext}"):
+                    try:
+                        aux_file.unlink()
+                    except (PermissionError, FileNotFoundError):
+                        pass
+
+    def generate_async(self, document: Document,
+                       output_name: Optional[str] = None,
+                       draft: bool = False,
+                       draft_only: bool = False) -> 'Future':
+        """
+        PDF生成をバックグラウンドで実行
+
+        LaTeXコンパイルはサブプロセスで行われるため、呼び出し側は
+        コンパイル中に次のドキュメントの構築を進められる。
+
+        Args:
+            document: Documentインスタンス
+            output_name: 出力ファイル名（省略時は自動生成）
+            draft: generate()と同じドラフトモード指定
+            draft_only: generate()と同じドラフトモード指定
+
+        Returns:
+            生成されたPDFファイルのパスを結果に持つFuture
+        """
+        executor = self._ensure_executor()
+        return executor.submit(self.generate, document, output_name,
+                               draft, draft_only)
+
+    def generate_many(self, documents: List[Document],
+                      output_names: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        複数のDocumentを並列にPDF生成
+
+        Args:
+            documents: Documentインスタンスのリスト
+            output_names: 出力ファイル名のリスト（省略時はすべて自動生成）
+
+        Returns:
+            生成されたPDFファイルのパスのリスト（documentsと同順）
+        """
+        if output_names is None:
+            output_names = [None] * len(documents)
+
+        futures = [
+            self.generate_async(document, output_name)
+            for document, output_name in zip(documents, output_names)
+        ]
+        return [future.result() for future in futures]
+
+    def generate(self, document: Document, output_name: Optional[str] = None,
+                 draft: bool = False, draft_only: bool = False) -> str:
         """
         DocumentからPDFを生成
-        
+
         Args:
             document: Documentインスタンス
             output_name: 出力ファイル名（省略時は自動生成）
-        
+            draft: Trueの場合、最終パス以外を-draftmodeで実行
+                （画像の描画を省略するため、画像が多いドキュメントの反復ビルドが速くなる）
+            draft_only: Trueの場合、すべてのパスを-draftmodeで実行
+                （ページレイアウトの検証用。PDFは生成されず.texファイルのパスを返す）
+
         Returns:
-            生成されたPDFファイルのパス
-        
+            生成されたPDFファイルのパス（draft_only時は.texファイルのパス）
+
         Raises:
             RuntimeError: コンパイルエラー時
         """
         output_dir = Path(self.config_manager.get("directories.output_dir", "output"))
         temp_dir = Path(self.config_manager.get("directories.temp_dir", output_dir))
+
+        # 複数パスのコンパイルでは、最終パス以外を-draftmodeで実行すると
+        # フォント埋め込みとPDF書き出しを省略できる（.aux/.tocは通常通り生成される）
+        draft = draft or self.config_manager.get("compilation.draft_first_pass", True)
+
+        # 画像の処理（コピー先のパスはPDFキャッシュのキーにも使う）
+        image_map = document.process_images(output_dir)
         
-        # 画像の処理
-        document.process_images(output_dir)
-        
+        # フォントのサブセット化（使用文字のみを含む軽量フォントに差し替え）
+        if (document.font_file
+                and self.config_manager.get("compilation.subset_fonts", False)):
+            self._subset_document_fonts(document)
+
         # フォントファイルの処理
         document.process_fonts(output_dir)
         
@@ -72,46 +310,97 @@ class PDFGenerator:
             else:
                 output_name = "document.pdf"
         
-        # 一時的な.texファイルを作成
-        temp_tex_file = temp_dir / f"{Path(output_name).stem}.tex"
-        temp_tex_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(temp_tex_file, "w",
-                  encoding=self.config_manager.get("encoding.output_encoding", "utf-8")) as f:
-            f.write(latex_content)
-        
         # フォントファイルが指定されている場合は、XeLaTeXまたはLuaLaTeXを使用
-        original_engine = self.compiler.engine
+        compiler = self._local_compiler()
+        original_engine = compiler.engine
         if document.font_file:
-            # XeLaTeXを優先的に試す（LuaLaTeXも可能）
-            preferred_engines = ["xelatex", "lualatex"]
+            # Tectonicがあれば優先（パッケージ/フォントキャッシュ内蔵）、
+            # なければXeLaTeX、LuaLaTeXの順に試す
+            preferred_engines = ["tectonic", "xelatex", "lualatex"]
             engine_found = False
             for engine in preferred_engines:
                 try:
                     # エンジンの存在確認
                     from ..utils.file_utils import check_command_exists
                     if check_command_exists(engine):
-                        self.compiler.engine = engine
+                        compiler.engine = engine
                         engine_found = True
                         break
                 except FileNotFoundError:
                     continue
-            
+
             if not engine_found:
                 import warnings
                 warnings.warn(
                     "フォントファイルが指定されていますが、XeLaTeXまたはLuaLaTeXが見つかりません。"
                     "デフォルトのエンジンを使用しますが、フォントが正しく表示されない可能性があります。"
                 )
-        
-        # PDFをコンパイル
-        success, error_msg = self.compiler.compile(str(temp_tex_file), output_dir)
-        
+
+        # ビルド済みPDFのキャッシュを確認（内容が同一なら再コンパイルしない）
+        cache_key = None
+        cached_pdf = None
+        if (not draft_only
+                and self.config_manager.get("file_management.use_pdf_cache", True)):
+            pdf_cache_dir = Path(self.config_manager.get(
+                "directories.pdf_cache_dir",
+                str(Path.home() / ".cache" / "math-textbook" / "pdf")
+            ))
+            # image_mapのキーは画像の元パス（値は"images/<名前>"という
+            # 出力相対パスで、プロセスのcwdからはstatできない）
+            cache_key = self._document_cache_key(latex_content, document.font_file,
+                                                 image_map.keys())
+            cached_pdf = pdf_cache_dir / f"{cache_key}.pdf"
+            if cached_pdf.exists():
+                from ..utils.file_utils import fast_copy
+                pdf_file = Path(output_dir) / output_name
+                pdf_file.parent.mkdir(parents=True, exist_ok=True)
+                fast_copy(cached_pdf, pdf_file)
+                compiler.engine = original_engine
+                return str(pdf_file)
+
+        # プリアンブルの事前コンパイル（.fmtキャッシュ）
+        output_encoding = self.config_manager.get("encoding.output_encoding", "utf-8")
+        format_file = None
+        tex_content_to_write = latex_content
+        if self.config_manager.get("compilation.precompile_preamble", True):
+            format_file, body = self._precompile_preamble(latex_content, output_encoding)
+            if format_file:
+                # プリアンブルは.fmtに取り込み済みなので本文のみ書き出す
+                tex_content_to_write = body
+
+        # 一時的な.texファイルを作成
+        temp_tex_file = temp_dir / f"{Path(output_name).stem}.tex"
+        temp_tex_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # バイナリ書き込みで一度だけエンコード（改行変換などの追加パスを避ける）
+        temp_tex_file.write_bytes(tex_content_to_write.encode(output_encoding))
+
+        # PDFをコンパイル（.fmt使用時に失敗した場合は通常のコンパイルにフォールバック）
+        try:
+            success, error_msg = compiler.compile(str(temp_tex_file), output_dir,
+                                                  format_file=format_file,
+                                                  draft=draft,
+                                                  draft_only=draft_only)
+        except RuntimeError:
+            if format_file is None:
+                raise
+            temp_tex_file.write_bytes(latex_content.encode(output_encoding))
+            success, error_msg = compiler.compile(str(temp_tex_file), output_dir,
+                                                  draft=draft,
+                                                  draft_only=draft_only)
+
         # エンジンを元に戻す
-        self.compiler.engine = original_engine
+        compiler.engine = original_engine
         
         if not success:
             raise RuntimeError(f"PDFのコンパイルに失敗しました:\n{error_msg}")
+
+        # draft_onlyの場合はPDFが生成されないため、.texファイルのパスを返す
+        if draft_only:
+            if error_msg:
+                import warnings
+                warnings.warn(f"ドラフトコンパイル時に警告がありました:\n{error_msg}")
+            return str(temp_tex_file)
         
         if error_msg:
             import warnings
@@ -128,24 +417,38 @@ class PDFGenerator:
         elif not pdf_file.exists() and compiled_pdf.exists():
             pdf_file = compiled_pdf
         
+        # 生成されたPDFをキャッシュに保存（次回以降の同一内容ビルドで再利用）
+        if cache_key is not None and cached_pdf is not None and pdf_file.exists():
+            from ..utils.file_utils import fast_copy
+            cached_pdf.parent.mkdir(parents=True, exist_ok=True)
+            fast_copy(pdf_file, cached_pdf)
+
         # クリーンアップ
         cleanup = self.config_manager.get("file_management.cleanup", True)
         if cleanup:
             keep_tex = self.config_manager.get("file_management.keep_tex", False)
             keep_log = self.config_manager.get("file_management.keep_log", False)
-            
-            extensions_to_remove = self.config_manager.get(
+            keep_aux = self.config_manager.get("file_management.keep_aux", True)
+
+            # setに取り直してから編集する（getは設定内のリストをそのまま返す
+            # ため、appendすると次回のgenerate()で拡張子が増殖する。重複排除も
+            # 兼ねる）
+            extensions_to_remove = set(self.config_manager.get(
                 "file_management.cleanup_extensions",
-                ['.aux', '.log', '.out', '.synctex.gz']
-            )
-            
+                ('.aux', '.log', '.out', '.synctex.gz')
+            ))
+
             if not keep_tex:
-                extensions_to_remove.append('.tex')
+                extensions_to_remove.add('.tex')
             if not keep_log:
-                if '.log' not in extensions_to_remove:
-                    extensions_to_remove.append('.log')
-            
-            self.compiler.cleanup(str(temp_tex_file), extensions_to_remove, output_dir)
+                extensions_to_remove.add('.log')
+            if keep_aux:
+                # .aux/.toc等を残しておくと、同じドキュメントの再コンパイル時に
+                # 参照解決済みの状態から始められる（明示的な削除はclean()で行う）
+                extensions_to_remove -= set(self._PERSISTENT_AUX_EXTENSIONS)
+
+            compiler.cleanup(str(temp_tex_file), sorted(extensions_to_remove),
+                             output_dir)
         
         return str(pdf_file)
 
@@ -2,6 +2,7 @@
 LaTeX要素の基底クラス
 """
 
+import io
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from pathlib import Path
@@ -10,21 +11,45 @@ import shutil
 
 class LaTeXElement(ABC):
     """LaTeX要素の基底クラス"""
-    
+
     def __init__(self):
         self.parent: Optional['LaTeXElement'] = None
         self.children: List['LaTeXElement'] = []
-    
+
     @abstractmethod
     def to_latex(self) -> str:
         """LaTeXコードに変換"""
         pass
-    
+
+    def emit(self, out: io.StringIO) -> None:
+        """
+        LaTeXコードをバッファへ直接書き込む
+
+        親要素が子のto_latex()を連結すると、入れ子の深さぶん部分木の
+        文字列が作り直される。コンテナ要素はこのメソッドをオーバーライド
+        して断片をoutへ書き、子にはchild.emit(out)を伝播させることで、
+        ドキュメント全体で1つのバッファに集約できる。デフォルト実装は
+        to_latex()の結果をそのまま書き込む（葉要素はこれで十分）。
+        """
+        out.write(self.to_latex())
+
     def add(self, element: 'LaTeXElement'):
         """子要素を追加"""
         element.parent = self
         self.children.append(element)
         return self
+
+    def add_many(self, elements: List['LaTeXElement']):
+        """
+        複数の子要素を一括追加（要素ごとのadd呼び出しより低オーバーヘッド）
+
+        Args:
+            elements: 追加する要素のリスト
+        """
+        for element in elements:
+            element.parent = self
+        self.children.extend(elements)
+        return self
     
     def process_resources(self, output_dir: Path) -> dict:
         """
@@ -2,10 +2,23 @@
 テキストボックス関連の要素
 """
 
-from typing import Optional, Dict
+import io
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
 from .base import LaTeXElement
 
 
+@lru_cache(maxsize=32)
+def _style_options(style_items: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    スタイル辞書の項目をtcolorboxのオプション文字列に変換
+
+    同じスタイル（例: Note/Warning/Infoの固定スタイルや共有定数）は
+    何度も出現するため、変換結果をキャッシュする。
+    """
+    return ", ".join(f"{k}={v}" for k, v in style_items)
+
+
 class TextBox(LaTeXElement):
     """テキストボックス要素"""
     
@@ -17,6 +30,10 @@ class TextBox(LaTeXElement):
         self.title = title
         self.box_type = box_type
         self.style = style or {}
+        # tcolorboxのオプション文字列（styleとtitleは構築後に変わらないため、
+        # 初回レンダリング時に組み立てた結果を使い回す。Note/Warning/Infoの
+        # 固定スタイルは_style_optionsのキャッシュとも共有される）
+        self._opt_str: Optional[str] = None
     
     def to_latex(self) -> str:
         if self.box_type == "tcolorbox":
@@ -25,34 +42,45 @@ class TextBox(LaTeXElement):
             return self._to_fancybox()
         else:
             return self._to_simple()
-    
-    def _to_tcolorbox(self) -> str:
-        opts = []
-        if self.style:
-            opts.extend([f"{k}={v}" for k, v in self.style.items()])
-        if self.title:
-            opts.append(f"title={{{self.title}}}")
-        
-        opt_str = f"[{', '.join(opts)}]" if opts else ""
-        result = f"\\begin{{tcolorbox}}{opt_str}\n"
-        result += f"{self.content}\n"
+
+    def emit(self, out: io.StringIO) -> None:
+        if self.box_type != "tcolorbox":
+            out.write(self.to_latex())
+            return
+
+        opt_str = self._opt_str
+        if opt_str is None:
+            opts = []
+            if self.style:
+                opts.append(_style_options(tuple(self.style.items())))
+            if self.title:
+                opts.append(f"title={{{self.title}}}")
+            opt_str = self._opt_str = f"[{', '.join(opts)}]" if opts else ""
+
+        out.write(f"\\begin{{tcolorbox}}{opt_str}\n")
+        out.write(self.content)
+        out.write("\n")
         for child in self.children:
-            result += child.to_latex()
-        result += "\\end{tcolorbox}\n"
-        return result
+            child.emit(out)
+        out.write("\\end{tcolorbox}\n")
+
+    def _to_tcolorbox(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf)
+        return buf.getvalue()
     
     def _to_fancybox(self) -> str:
-        result = "\\fbox{\n"
-        result += "    \\parbox{0.9\\textwidth}{\n"
+        parts = ["\\fbox{\n", "    \\parbox{0.9\\textwidth}{\n"]
         if self.title:
-            result += f"        \\textbf{{{self.title}}}\\\\\n"
-        result += f"        {self.content}\n"
+            parts.append(f"        \\textbf{{{self.title}}}\\\\\n")
+        parts.append(f"        {self.content}\n")
         for child in self.children:
             child_latex = child.to_latex()
-            result += "        " + child_latex.replace("\n", "\n        ")
-        result += "    }\n"
-        result += "}\n"
-        return result
+            parts.append("        ")
+            parts.append(child_latex.replace("\n", "\n        "))
+        parts.append("    }\n")
+        parts.append("}\n")
+        return "".join(parts)
     
     def _to_simple(self) -> str:
         return f"\\fbox{{\\parbox{{0.9\\textwidth}}{{{self.content}}}}}\n"
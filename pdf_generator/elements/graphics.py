@@ -2,10 +2,20 @@
 画像・図表関連の要素
 """
 
+import re
 from pathlib import Path
 from typing import Optional, List
-import shutil
 from .base import LaTeXElement
+from ..utils.file_utils import fast_copy
+
+# float()で解釈できる数値リテラルの判定（width="0.8"のような倍率指定）。
+# try/exceptによる判定は例外経路がCPythonで高くつくため、正規表現で済ませる
+_NUMERIC_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+
+# コピー済み画像の記録: (コピー元絶対パス, コピー先ディレクトリ) -> 元のmtime_ns
+# 同じ図が多数のExerciseで再利用されるドキュメントで、2回目以降のコピーを省く。
+# 元ファイルが更新された場合はmtimeの不一致で再コピーされる
+_copied: dict = {}
 
 
 class Image(LaTeXElement):
@@ -24,43 +34,50 @@ class Image(LaTeXElement):
         self.position = position
         self.inline = inline
         self.processed_path: Optional[str] = None
-    
-    def to_latex(self) -> str:
-        path = self.processed_path or str(self.image_path).replace('\\', '/')
-        
+        # includegraphicsのオプション文字列（width/heightは構築後に変わらない
+        # ため、初回のto_latex()で組み立てた結果を使い回す）
+        self._opt_str: Optional[str] = None
+
+    def _build_opt_str(self) -> str:
         opts = []
         if self.width:
             # 数値のみの場合は\textwidthを付加、それ以外はそのまま
-            try:
-                float(self.width)
+            if _NUMERIC_RE.match(self.width):
                 opts.append(f"width={self.width}\\textwidth")
-            except ValueError:
+            else:
                 opts.append(f"width={self.width}")
-                
+
         if self.height:
             opts.append(f"height={self.height}\\textheight")
-        
-        opt_str = f"[{', '.join(opts)}]" if opts else ""
-        
+
+        return f"[{', '.join(opts)}]" if opts else ""
+
+    def to_latex(self) -> str:
+        path = self.processed_path or str(self.image_path).replace('\\', '/')
+
+        opt_str = self._opt_str
+        if opt_str is None:
+            opt_str = self._opt_str = self._build_opt_str()
+
+        # 文字列連結のO(n^2)を避けるため、リストに集めて結合
         if self.inline:
             # インライン表示（figure環境なし）
-            result = "{\\centering\n"
-            result += f"\\includegraphics{opt_str}{{{path}}}\n"
+            parts = ["{\\centering\n", f"\\includegraphics{opt_str}{{{path}}}\n"]
             if self.caption:
-                result += f"\\par\\textit{{{self.caption}}}\n"
-            result += "\\par}\n"
-            return result
+                parts.append(f"\\par\\textit{{{self.caption}}}\n")
+            parts.append("\\par}\n")
         else:
-            result = f"\\begin{{figure}}[{self.position}]\n"
-            result += "    \\centering\n"
-            result += f"    \\includegraphics{opt_str}{{{path}}}\n"
-            
+            parts = [
+                f"\\begin{{figure}}[{self.position}]\n",
+                "    \\centering\n",
+                f"    \\includegraphics{opt_str}{{{path}}}\n",
+            ]
             if self.caption:
-                result += f"    \\caption{{{self.caption}}}\n"
+                parts.append(f"    \\caption{{{self.caption}}}\n")
             if self.label:
-                result += f"    \\label{{{self.label}}}\n"
-            result += "\\end{figure}\n"
-            return result
+                parts.append(f"    \\label{{{self.label}}}\n")
+            parts.append("\\end{figure}\n")
+        return "".join(parts)
     
     def process_resources(self, output_dir: Path) -> dict:
         """画像ファイルをコピー"""
@@ -69,10 +86,15 @@ class Image(LaTeXElement):
         
         images_dir = output_dir / "images"
         images_dir.mkdir(parents=True, exist_ok=True)
-        
+
         dest_path = images_dir / self.image_path.name
-        shutil.copy2(self.image_path, dest_path)
-        
+        key = (str(self.image_path.resolve()), str(images_dir))
+        src_mtime = self.image_path.stat().st_mtime_ns
+        if _copied.get(key) != src_mtime or not dest_path.exists():
+            # sendfileによるカーネル内コピー（メタデータの保存は不要）
+            fast_copy(self.image_path, dest_path)
+            _copied[key] = src_mtime
+
         self.processed_path = f"images/{self.image_path.name}"
         return {str(self.image_path): self.processed_path}
 
@@ -107,22 +129,19 @@ class TikZ(LaTeXElement):
     def to_latex(self) -> str:
         tikz_code = "\\begin{tikzpicture}\n" + self.code + "\n\\end{tikzpicture}"
         
+        # 文字列連結のO(n^2)を避けるため、リストに集めて結合
         if self.inline:
             # インライン表示（figure環境なし）
-            result = "{\\centering\n"
-            result += tikz_code + "\n"
+            parts = ["{\\centering\n", tikz_code, "\n"]
             if self.caption:
-                result += f"\\par\\textit{{{self.caption}}}\n"
-            result += "\\par}\n"
-            return result
+                parts.append(f"\\par\\textit{{{self.caption}}}\n")
+            parts.append("\\par}\n")
         else:
-            result = "\\begin{figure}[h]\n"
-            result += "    \\centering\n"
-            result += "    " + tikz_code + "\n"
-            
+            parts = ["\\begin{figure}[h]\n", "    \\centering\n",
+                     "    ", tikz_code, "\n"]
             if self.caption:
-                result += f"    \\caption{{{self.caption}}}\n"
+                parts.append(f"    \\caption{{{self.caption}}}\n")
             if self.label:
-                result += f"    \\label{{{self.label}}}\n"
-            result += "\\end{figure}\n"
-            return result
+                parts.append(f"    \\label{{{self.label}}}\n")
+            parts.append("\\end{figure}\n")
+        return "".join(parts)
@@ -2,7 +2,7 @@
 数式関連の要素
 """
 
-from typing import Optional, List
+from typing import Optional, Sequence
 from .base import LaTeXElement
 
 
@@ -14,41 +14,45 @@ class Equation(LaTeXElement):
         self.equation = equation
         self.inline = inline
         self.label = label
-    
-    def to_latex(self) -> str:
-        if self.inline:
-            result = f"${self.equation}$"
-        else:
-            result = "\\[\n"
-            result += f"    {self.equation}\n"
-            result += "\\]"
-            if self.label:
-                result += f"\n\\label{{{self.label}}}"
-        
-        return result
+        # インライン数式は大量に現れるため、構築時にレンダリング方法を
+        # 選んでおき、呼び出しごとのinline分岐を省く
+        self.to_latex = self._to_latex_inline if inline else self._to_latex_display
+
+    def to_latex(self) -> str:  # インスタンス属性で上書きされる
+        return self._to_latex_display()
+
+    def _to_latex_inline(self) -> str:
+        return "$" + self.equation + "$"
+
+    def _to_latex_display(self) -> str:
+        parts = ["\\[\n", f"    {self.equation}\n", "\\]"]
+        if self.label:
+            parts.append(f"\n\\label{{{self.label}}}")
+        return "".join(parts)
 
 
 class Align(LaTeXElement):
     """複数行の数式（align環境）"""
     
-    def __init__(self, equations: List[str], label: Optional[str] = None, numbered: bool = True, vspace: Optional[str] = None):
+    def __init__(self, equations: Sequence[str], label: Optional[str] = None, numbered: bool = True, vspace: Optional[str] = None):
         super().__init__()
-        self.equations = equations
+        # イテラブルを受け取り、イミュータブルなtupleとして保持する
+        self.equations = tuple(equations)
         self.label = label
         self.numbered = numbered
         self.vspace = vspace
     
     def to_latex(self) -> str:
         env_name = "align" if self.numbered else "align*"
-        result = ""
+        parts = []
         if self.vspace:
-            result += f"\\vspace{{{self.vspace}}}\n"
-            
-        result += f"\\begin{{{env_name}}}\n"
+            parts.append(f"\\vspace{{{self.vspace}}}\n")
+
+        parts.append(f"\\begin{{{env_name}}}\n")
         for eq in self.equations:
-            result += f"    {eq}\n"
+            parts.append(f"    {eq}\n")
         if self.label:
-            result += f"    \\label{{{self.label}}}\n"
-        result += f"\\end{{{env_name}}}\n"
-        return result
+            parts.append(f"    \\label{{{self.label}}}\n")
+        parts.append(f"\\end{{{env_name}}}\n")
+        return "".join(parts)
 
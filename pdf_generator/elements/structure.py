@@ -2,11 +2,21 @@
 ドキュメント構造要素
 """
 
+import io
 from typing import Optional, List, Union
 from pathlib import Path
 from .base import LaTeXElement
 from ..utils.encoding import escape_latex_special_chars
 
+# Exerciseが毎回出力する定型のLaTeX断片（呼び出しごとの再構築を避ける）
+_EXERCISE_ITEMS_VSPACE = "\\vspace{-1.5em}\n"
+_EXERCISE_ITEMS_HEADER = (
+    "\\begin{enumerate}\n"
+    "  \\renewcommand{\\labelenumi}{(\\arabic{enumi})}\n"
+)
+_EXERCISE_ITEMS_FOOTER = "\\end{enumerate}\n"
+_EXERCISE_FOOTER = "\\par\n\\vspace{0.5em}\n"
+
 
 class BlankSpace(LaTeXElement):
     """
@@ -29,7 +39,16 @@ class BlankSpace(LaTeXElement):
 
 class Section(LaTeXElement):
     """セクション要素"""
-    
+
+    # 見出しレベル -> LaTeXコマンドの対応（呼び出しごとの辞書構築を避ける）
+    _COMMANDS = {
+        1: "\\section",
+        2: "\\subsection",
+        3: "\\subsubsection",
+        4: "\\paragraph",
+        5: "\\subparagraph"
+    }
+
     def __init__(self, title: str, level: int = 1, label: Optional[str] = None, numbered: bool = True):
         super().__init__()
         self.title = title
@@ -38,29 +57,25 @@ class Section(LaTeXElement):
         self.numbered = numbered
     
     def to_latex(self) -> str:
-        commands = {
-            1: "\\section",
-            2: "\\subsection",
-            3: "\\subsubsection",
-            4: "\\paragraph",
-            5: "\\subparagraph"
-        }
-        
-        cmd = commands.get(self.level, "\\section")
+        buf = io.StringIO()
+        self.emit(buf)
+        return buf.getvalue()
+
+    def emit(self, out: io.StringIO) -> None:
+        cmd = self._COMMANDS.get(self.level, "\\section")
         if not self.numbered:
             cmd += "*"
-            
-        result = f"{cmd}{{{self.title}}}\n"
-        
+
+        out.write(f"{cmd}{{{self.title}}}\n")
+
         if self.label:
-            result += f"\\label{{{self.label}}}\n"
-        
-        result += "\n"
-        
+            out.write(f"\\label{{{self.label}}}\n")
+
+        out.write("\n")
+
         for child in self.children:
-            result += child.to_latex() + "\n"
-        
-        return result
+            child.emit(out)
+            out.write("\n")
 
 
 class Chapter(LaTeXElement):
@@ -72,15 +87,19 @@ class Chapter(LaTeXElement):
         self.label = label
     
     def to_latex(self) -> str:
-        result = f"\\chapter{{{self.title}}}\n"
+        buf = io.StringIO()
+        self.emit(buf)
+        return buf.getvalue()
+
+    def emit(self, out: io.StringIO) -> None:
+        out.write(f"\\chapter{{{self.title}}}\n")
         if self.label:
-            result += f"\\label{{{self.label}}}\n"
-        result += "\n"
-        
+            out.write(f"\\label{{{self.label}}}\n")
+        out.write("\n")
+
         for child in self.children:
-            result += child.to_latex() + "\n"
-        
-        return result
+            child.emit(out)
+            out.write("\n")
 
 
 class TableOfContents(LaTeXElement):
@@ -112,37 +131,44 @@ class DrawingSpace(LaTeXElement):
         self.margin_content = margin_content
     
     def to_latex(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf)
+        return buf.getvalue()
+
+    def emit(self, out: io.StringIO) -> None:
         # 左側のコンテンツ用minipageと、右側のマージン用minipageを並べる
-        result = "\\noindent\n"
-        
+        out.write("\\noindent\n")
+
         # 左側のminipage
-        result += f"\\begin{{minipage}}[t]{{{self.width}}}\n"
+        out.write(f"\\begin{{minipage}}[t]{{{self.width}}}\n")
         for child in self.children:
-            result += child.to_latex() + "\n"
-        result += f"\\end{{minipage}}\n"
-        
+            child.emit(out)
+            out.write("\n")
+        out.write("\\end{minipage}\n")
+
         # 右側のマージン用minipage
         # 左側のminipageとの間に少し隙間を開けるか、ぴったりくっつけるか
         # ここではぴったりくっつけて、マージン幅を確保する
-        result += f"\\begin{{minipage}}[t]{{{self.right_margin}}}\n"
-        
+        out.write(f"\\begin{{minipage}}[t]{{{self.right_margin}}}\n")
+
         if self.margin_content:
             if isinstance(self.margin_content, str):
                 # 文字列の場合はそのままLaTeXとして出力（呼び出し側でImage要素などに変換されていることを想定）
                 # あるいは単純なテキストとして出力
-                result += f"{self.margin_content}\n"
+                out.write(f"{self.margin_content}\n")
+            elif hasattr(self.margin_content, 'emit'):
+                self.margin_content.emit(out)
             elif hasattr(self.margin_content, 'to_latex'):
-                result += self.margin_content.to_latex()
+                out.write(self.margin_content.to_latex())
         else:
             # コンテンツがない場合は、高さ確保のために空のボックスを置くか、単に何もしない
             # minipageの幅は確保される
-            result += "\\null\n"
-            
-        result += f"\\end{{minipage}}\n"
-        
-        result += "\\par\n"  # 段落を終了
-        result += "\\vspace{1em}\n"  # 追加の間隔を確保
-        return result
+            out.write("\\null\n")
+
+        out.write("\\end{minipage}\n")
+
+        out.write("\\par\n")  # 段落を終了
+        out.write("\\vspace{1em}\n")  # 追加の間隔を確保
 
     def process_resources(self, output_dir: Path) -> dict:
         """リソース（画像など）を処理"""
@@ -172,43 +198,44 @@ class Exercise(LaTeXElement):
         self.content = content
         self.items = items or []
         self.columns = columns
-    
+        # タイトルは構築後に変わらないため、ここで一度だけエスケープする
+        # （本文・アイテムは数式を含むため意図的にエスケープしない）
+        self._escaped_title = escape_latex_special_chars(title)
+
     def to_latex(self) -> str:
-        # タイトルと本文をエスケープ
-        escaped_title = escape_latex_special_chars(self.title)
-        # 修正: 本文（content）は数式を含むためエスケープしない
-        content = self.content
-        
+        buf = io.StringIO()
+        self.emit(buf)
+        return buf.getvalue()
+
+    def emit(self, out: io.StringIO) -> None:
         # タイトルを太字で表示し、間隔をあけて問題の本文を配置（横並び）
-        result = "\\noindent\n"
-        # 修正: escaped_content ではなく content を使用
-        result += f"\\textbf{{{escaped_title}}}\\quad {content}\n"
-        
+        # （本文は数式を含むためエスケープせずそのまま出力する）
+        out.write("\\noindent\n")
+        out.write(f"\\textbf{{{self._escaped_title}}}\\quad {self.content}\n")
+
         # 小問リストがある場合
         if self.items:
             # 余白を調整
-            result += "\\vspace{-1.5em}\n"
+            out.write(_EXERCISE_ITEMS_VSPACE)
 
             # 列数が2以上の場合はmulticol環境を使用
             if self.columns > 1:
-                result += f"\\begin{{multicols}}{{{self.columns}}}\n"
-            
-            result += "\\begin{enumerate}\n"
-            # ラベルを (1), (2)... の形式に変更
-            result += "  \\renewcommand{\\labelenumi}{(\\arabic{enumi})}\n"
+                out.write(f"\\begin{{multicols}}{{{self.columns}}}\n")
+
+            # enumerate開始＋ラベルを (1), (2)... の形式に変更
+            out.write(_EXERCISE_ITEMS_HEADER)
+
             for item in self.items:
                 # 修正: アイテムも数式を含むためエスケープしない
-                result += f"  \\item {item}\n"
-            result += "\\end{enumerate}\n"
-            
+                out.write(f"  \\item {item}\n")
+            out.write(_EXERCISE_ITEMS_FOOTER)
+
             if self.columns > 1:
-                result += "\\end{multicols}\n"
-            
-        result += "\\par\n"
-        result += "\\vspace{0.5em}\n"  # 適切な間隔を確保
-        
+                out.write("\\end{multicols}\n")
+
+        out.write(_EXERCISE_FOOTER)  # 適切な間隔を確保
+
         # 子要素があれば追加
         for child in self.children:
-            result += child.to_latex() + "\n"
-        
-        return result
\ No newline at end of file
+            child.emit(out)
+            out.write("\n")
\ No newline at end of file
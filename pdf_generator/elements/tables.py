@@ -2,41 +2,51 @@
 テーブル関連の要素
 """
 
-from typing import List, Optional
+from typing import Optional, Sequence
 from .base import LaTeXElement
 
 
 class Table(LaTeXElement):
     """テーブル要素"""
-    
-    def __init__(self, headers: List[str], rows: List[List[str]],
+
+    def __init__(self, headers: Sequence[str], rows: Sequence[Sequence[str]],
                  caption: Optional[str] = None, label: Optional[str] = None,
                  position: str = "h"):
         super().__init__()
-        self.headers = headers
-        self.rows = rows
+        # イテラブルを受け取り、イミュータブルなtupleとして保持する
+        # （呼び出し側のリストをコピーせずジェネレータも渡せる）
+        self.headers = tuple(headers)
+        self.rows = tuple(rows)
         self.caption = caption
         self.label = label
         self.position = position
-    
-    def to_latex(self) -> str:
+        # 行はこの時点で確定するため、列数の検証も1回だけ行う
         num_cols = len(self.headers)
-        result = f"\\begin{{table}}[{self.position}]\n"
-        result += "    \\centering\n"
-        result += f"    \\begin{{tabular}}{{|{'|'.join(['c'] * num_cols)}|}}\n"
-        result += "        \\hline\n"
-        result += "        " + " & ".join(self.headers) + " \\\\\n"
-        result += "        \\hline\n"
         for row in self.rows:
             if len(row) != num_cols:
                 raise ValueError(f"行の列数が一致しません: 期待値={num_cols}, 実際={len(row)}")
-            result += "        " + " & ".join(row) + " \\\\\n"
-        result += "        \\hline\n"
-        result += "    \\end{tabular}\n"
+
+    def to_latex(self) -> str:
+        num_cols = len(self.headers)
+        # 文字列連結のO(n^2)を避けるため、リストに集めて結合
+        parts = [
+            f"\\begin{{table}}[{self.position}]\n",
+            "    \\centering\n",
+            f"    \\begin{{tabular}}{{|{'|'.join(['c'] * num_cols)}|}}\n",
+            "        \\hline\n",
+            "        " + " & ".join(self.headers) + " \\\\\n",
+            "        \\hline\n",
+        ]
+        if self.rows:
+            # 行ループの連結を1回のjoinにまとめる
+            body = " \\\\\n        ".join(" & ".join(r) for r in self.rows)
+            parts.append("        " + body + " \\\\\n")
+        parts.append("        \\hline\n")
+        parts.append("    \\end{tabular}\n")
         if self.caption:
-            result += f"    \\caption{{{self.caption}}}\n"
+            parts.append(f"    \\caption{{{self.caption}}}\n")
         if self.label:
-            result += f"    \\label{{{self.label}}}\n"
-        result += "\\end{table}\n"
-        return result
+            parts.append(f"    \\label{{{self.label}}}\n")
+        parts.append("\\end{table}\n")
+        return "".join(parts)
 
@@ -2,10 +2,36 @@
 テキスト関連の要素
 """
 
-from typing import List, Optional
+from typing import Optional, Sequence
 from .base import LaTeXElement
 from ..utils.encoding import escape_latex_special_chars
 
+# Line/Dividerが毎回出力する定型のLaTeX断片（呼び出しごとの再構築を避ける）
+_LINE_HEADER = "\\par\\noindent\n\\makebox[\\textwidth][s]{"
+_LINE_FOOTER = "}\n\\par\n"
+_DIVIDER_OPEN = "\\begin{center}\n"
+_DIVIDER_CLOSE = "\n\\end{center}\n"
+
+# 線スタイルごとのコマンドテンプレート（t=太さ, g=二重線の間隔, c=色）。
+# レンダリングごとのif/elif分岐とf-string組み立てを、テーブル引き1回と
+# format1回に置き換える。色付きはtextcolorで包んだ版を導出しておく
+_LINE_CMD_BASE = {
+    # 実線: \hrulefill は \leaders\hrule height 0.4pt \hfill のショートカット
+    "solid": "\\leaders\\hrule height {t} \\hfill",
+    # 破線: \leadersで線の長さと間隔のパターンを生成
+    "dashed": "\\leaders\\hbox to 0.5em{{\\hss\\rule[-0.2pt]{{0.4em}}{{{t}}}\\hss}}\\hfill",
+    # 点線: \leadersで点のパターンを生成
+    "dotted": "\\leaders\\hbox to 0.5em{{\\hss\\rule[-0.2pt]{{0.1pt}}{{{t}}}\\hss}}\\hfill",
+    # 二重線: 2本の線を太さに応じた間隔（gap）で重ねる
+    "double": "\\leaders\\hrule height {t} \\hfill\\vspace{{{g}}}"
+              "\\leaders\\hrule height {t} \\hfill",
+}
+_LINE_CMD_TEMPLATES = {}
+for _style, _tmpl in _LINE_CMD_BASE.items():
+    _LINE_CMD_TEMPLATES[(_style, False)] = _tmpl
+    _LINE_CMD_TEMPLATES[(_style, True)] = "\\textcolor{{{c}}}{{" + _tmpl + "}}"
+del _style, _tmpl
+
 
 class Text(LaTeXElement):
     """テキスト要素"""
@@ -19,12 +45,14 @@ class Text(LaTeXElement):
         if self.bold:
             # LaTeXの特殊文字をエスケープしてから\textbfコマンドで囲む
             escaped_text = escape_latex_special_chars(self.text)
-            result = f"\\noindent \\textbf{{{escaped_text}}}"
+            parts = [f"\\noindent \\textbf{{{escaped_text}}}"]
         else:
-            result = f"\\noindent {self.text}"
+            parts = [f"\\noindent {self.text}"]
         for child in self.children:
-            result += "\n" + child.to_latex()
-        return result + "\n\n"
+            parts.append("\n")
+            parts.append(child.to_latex())
+        parts.append("\n\n")
+        return "".join(parts)
     
     def process_resources(self, output_dir):
         result = {}
@@ -48,27 +76,27 @@ class Paragraph(LaTeXElement):
             text_content = f"\\textbf{{{escaped_text}}}"
         else:
             text_content = self.text
-        result = f"\\noindent {text_content}\n\n"
+        parts = [f"\\noindent {text_content}\n\n"]
         for child in self.children:
-            result += child.to_latex() + "\n"
-        return result
+            parts.append(child.to_latex())
+            parts.append("\n")
+        return "".join(parts)
 
 
 class List(LaTeXElement):
     """リスト要素"""
     
-    def __init__(self, items: List[str], ordered: bool = False):
+    def __init__(self, items: Sequence[str], ordered: bool = False):
         super().__init__()
-        self.items = items
+        # イテラブルを受け取り、イミュータブルなtupleとして保持する
+        self.items = tuple(items)
         self.ordered = ordered
     
     def to_latex(self) -> str:
         env = "enumerate" if self.ordered else "itemize"
-        result = f"\\begin{{{env}}}\n"
-        for item in self.items:
-            result += f"    \\item {item}\n"
-        result += f"\\end{{{env}}}\n"
-        return result
+        # 項目部分は1回のjoinでまとめて確保する（項目ごとのappendを省く）
+        body = "".join("    \\item " + item + "\n" for item in self.items)
+        return f"\\begin{{{env}}}\n{body}\\end{{{env}}}\n"
 
 
 class Line(LaTeXElement):
@@ -94,69 +122,44 @@ class Line(LaTeXElement):
         self.line_style = line_style
         self.line_thickness = line_thickness
         self.color = color
-    
+        # 二重線の間隔は太さに応じて調整（太さの1.5倍程度）。
+        # 太さは不変なので構築時に1回だけパースしておく
+        self._double_gap = (
+            f"{-float(line_thickness.replace('pt', '')) * 1.5}pt"
+            if 'pt' in line_thickness else "-0.6pt")
+
     def to_latex(self) -> str:
         # テキストをエスケープ
         escaped_text = escape_latex_special_chars(self.text)
-        
-        # 線のスタイルに応じたLaTeXコマンドを生成
+
+        # 線のスタイルに応じたLaTeXコマンドを生成（未知のスタイルは実線）
         # \leadersを使用して太さを制御可能にする
         thickness = self.line_thickness
-        
-        if self.line_style == "solid":
-            # 実線: \leaders\hrule height {thickness} \hfill を使用
-            # \hrulefill は \leaders\hrule height 0.4pt \hfill のショートカット
-            if self.color:
-                line_cmd = f"\\textcolor{{{self.color}}}{{\\leaders\\hrule height {thickness} \\hfill}}"
-            else:
-                line_cmd = f"\\leaders\\hrule height {thickness} \\hfill"
-        elif self.line_style == "dashed":
-            # 破線: \leaders を使って破線パターンを生成
-            # 破線のパターン: 線の長さと間隔を調整
-            dash_length = "0.5em"
-            dash_gap = "0.3em"
-            if self.color:
-                line_cmd = f"\\textcolor{{{self.color}}}{{\\leaders\\hbox to {dash_length}{{\\hss\\rule[-0.2pt]{{0.4em}}{{{thickness}}}\\hss}}\\hfill}}"
-            else:
-                line_cmd = f"\\leaders\\hbox to {dash_length}{{\\hss\\rule[-0.2pt]{{0.4em}}{{{thickness}}}\\hss}}\\hfill"
-        elif self.line_style == "dotted":
-            # 点線: \leaders を使って点のパターンを生成
-            dot_spacing = "0.5em"
-            if self.color:
-                line_cmd = f"\\textcolor{{{self.color}}}{{\\leaders\\hbox to {dot_spacing}{{\\hss\\rule[-0.2pt]{{0.1pt}}{{{thickness}}}\\hss}}\\hfill}}"
-            else:
-                line_cmd = f"\\leaders\\hbox to {dot_spacing}{{\\hss\\rule[-0.2pt]{{0.1pt}}{{{thickness}}}\\hss}}\\hfill"
-        elif self.line_style == "double":
-            # 二重線: 2本の線を適切な間隔で配置
-            # 線の間隔は太さに応じて調整（太さの1.5倍程度）
-            gap = f"{-float(thickness.replace('pt', '')) * 1.5}pt" if 'pt' in thickness else "-0.6pt"
-            if self.color:
-                line_cmd = f"\\textcolor{{{self.color}}}{{\\leaders\\hrule height {thickness} \\hfill\\vspace{{{gap}}}\\leaders\\hrule height {thickness} \\hfill}}"
-            else:
-                line_cmd = f"\\leaders\\hrule height {thickness} \\hfill\\vspace{{{gap}}}\\leaders\\hrule height {thickness} \\hfill"
-        else:
-            # デフォルトは実線
-            if self.color:
-                line_cmd = f"\\textcolor{{{self.color}}}{{\\leaders\\hrule height {thickness} \\hfill}}"
-            else:
-                line_cmd = f"\\leaders\\hrule height {thickness} \\hfill"
-        
+        has_color = self.color is not None
+
+        tmpl = _LINE_CMD_TEMPLATES.get((self.line_style, has_color))
+        if tmpl is None:
+            tmpl = _LINE_CMD_TEMPLATES[("solid", has_color)]
+
+        line_cmd = tmpl.format(t=thickness, g=self._double_gap, c=self.color)
+
         # テキスト領域の端まで線を引くレイアウト
         # \makebox[\textwidth] を使ってテキスト領域の幅に合わせる
         # テキストは中央に配置し、左右に線を引く
         # center環境は上下に大きな余白を作るため、\noindentを使用
-        result = "\\par\\noindent\n"
-        result += "\\makebox[\\textwidth][s]{"
-        result += line_cmd
-        result += f"\\quad\\textbf{{{escaped_text}}}\\quad"
-        result += line_cmd
-        result += "}\n"
-        result += "\\par\n"
-        
+        parts = [
+            _LINE_HEADER,
+            line_cmd,
+            f"\\quad\\textbf{{{escaped_text}}}\\quad",
+            line_cmd,
+            _LINE_FOOTER,
+        ]
+
         for child in self.children:
-            result += child.to_latex() + "\n"
-        
-        return result
+            parts.append(child.to_latex())
+            parts.append("\n")
+
+        return "".join(parts)
 
 
 class Divider(LaTeXElement):
@@ -184,17 +187,19 @@ class Divider(LaTeXElement):
         escaped_symbol = escape_latex_special_chars(self.symbol)
         
         # 3つの記号を指定された間隔で配置
-        result = f"\\vspace{{{self.vspace_before}}}\n"  # 上の余白
-        result += "\\begin{center}\n"
-        result += f"{escaped_symbol}\\hspace{{{self.spacing}}} {escaped_symbol}\\hspace{{{self.spacing}}} {escaped_symbol}"
-        result += "\n"
-        result += "\\end{center}\n"
-        result += f"\\vspace{{{self.vspace_after}}}\n"  # 下の余白
-        
+        parts = [
+            f"\\vspace{{{self.vspace_before}}}\n",  # 上の余白
+            _DIVIDER_OPEN,
+            f"{escaped_symbol}\\hspace{{{self.spacing}}} {escaped_symbol}\\hspace{{{self.spacing}}} {escaped_symbol}",
+            _DIVIDER_CLOSE,
+            f"\\vspace{{{self.vspace_after}}}\n",  # 下の余白
+        ]
+
         for child in self.children:
-            result += child.to_latex() + "\n"
-        
-        return result
+            parts.append(child.to_latex())
+            parts.append("\n")
+
+        return "".join(parts)
     
     def process_resources(self, output_dir):
         result = {}
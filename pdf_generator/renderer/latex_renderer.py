@@ -2,73 +2,91 @@
 LaTeXコードを生成するレンダラー
 """
 
+import io
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..core.document import Document
 
+# 毎回出力する定型断片（レンダリングごとの再構築を避ける）。
+# CJK開始タグのみフォント名が入るため%テンプレートにしておく
+_DOC_BEGIN = "\\begin{document}\n"
+_DOC_END = "\\end{document}\n"
+_CJK_BEGIN = "\\begin{CJK}{UTF8}{%s}\n"
+_CJK_END = "\\end{CJK}\n"
+
 
 class LaTeXRenderer:
-    """LaTeXコードを生成するレンダラー"""
-    
-    def render_document(self, document: 'Document') -> str:
+    """LaTeXコードを生成するレンダラー
+
+    インスタンス状態を持たないため、メソッドはすべてstaticmethod
+    （Document._shared_rendererのような共有インスタンス経由の呼び出しも
+    そのまま動く）
+    """
+
+    @staticmethod
+    def render_document(document: 'Document') -> str:
         """ドキュメント全体をLaTeXコードに変換"""
-        latex = []
-        
+        # ドキュメント全体で1つのバッファに書き込む
+        # （要素ごとに部分木の文字列を作って連結すると、入れ子の深さぶん
+        # 中間文字列が生成される。emit()はコンテナ要素の断片を直接ここへ書く）
+        out = io.StringIO()
+
         # プリアンブル（余白設定、行間設定、フォントファイル情報を渡す）
-        latex.append(document.preamble_manager.generate_preamble(
+        out.write(document.preamble_manager.generate_preamble(
             margins=document.margins,
             line_spacing=document.line_spacing,
             font_file=document.font_file,
             font_name=document.font_name
         ))
-        latex.append("\n")
-        
+        out.write("\n")
+
         # ドキュメント開始
-        latex.append("\\begin{document}\n")
-        
+        out.write(_DOC_BEGIN)
+
         # フォントファイルが指定されていない場合のみCJK環境を使用
         if document.font_file is None:
             # フォント設定を反映（デフォルト: min=明朝体, goth=ゴシック体）
-            latex.append(f"\\begin{{CJK}}{{UTF8}}{{{document.font}}}\n")
-        
+            out.write(_CJK_BEGIN % document.font)
+
         # タイトル（titleが設定されている場合のみ）
-        title_content = self._render_title(document)
+        title_content = LaTeXRenderer._render_title(document)
         if title_content:
-            latex.append(title_content)
-        
+            out.write(title_content)
+
         # アブストラクト
         if document.abstract:
-            latex.append("\\begin{abstract}\n")
-            latex.append(f"{document.abstract}\n")
-            latex.append("\\end{abstract}\n\n")
-        
+            out.write("\\begin{abstract}\n")
+            out.write(f"{document.abstract}\n")
+            out.write("\\end{abstract}\n\n")
+
         # コンテンツ
         for element in document.content:
-            latex.append(element.to_latex())
-            latex.append("\n")
-        
+            element.emit(out)
+            out.write("\n")
+
         # ドキュメント終了
         if document.font_file is None:
-            latex.append("\\end{CJK}\n")
-        latex.append("\\end{document}\n")
-        
-        return "".join(latex)
+            out.write(_CJK_END)
+        out.write(_DOC_END)
+
+        return out.getvalue()
     
-    def _render_title(self, document: 'Document') -> str:
+    @staticmethod
+    def _render_title(document: 'Document') -> str:
         # titleがNoneまたは空文字列の場合は何も表示しない
         if not document.title:
             return ""
         
-        result = "\\begin{center}\n"
-        result += f"{{\\Large\\bfseries {document.title} }}\\\\[1em]\n"
+        parts = ["\\begin{center}\n"]
+        parts.append(f"{{\\Large\\bfseries {document.title} }}\\\\[1em]\n")
         if document.author:
-            result += f"{document.author} \\\\[0.5em]\n"
+            parts.append(f"{document.author} \\\\[0.5em]\n")
         if document.date:
-            result += f"{document.date}\n"
+            parts.append(f"{document.date}\n")
         elif document.author:
-            result += "\\today\n"
-        result += "\\end{center}\n"
-        result += "\\vspace{2em}\n\n"
-        return result
+            parts.append("\\today\n")
+        parts.append("\\end{center}\n")
+        parts.append("\\vspace{2em}\n\n")
+        return "".join(parts)
 
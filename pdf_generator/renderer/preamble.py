@@ -2,42 +2,179 @@
 LaTeXプリアンブルを管理するクラス
 """
 
-from typing import Dict, Optional, List
+import functools
+import io
+import os
+from typing import Dict, Optional, List, Tuple
 from pathlib import Path
 
 
+def _render_usepackage(package: str, options: Optional[str]) -> str:
+    """\\usepackage行を整形する"""
+    if options:
+        return f"\\usepackage{options}{{{package}}}\n"
+    return f"\\usepackage{{{package}}}\n"
+
+
+# デフォルトパッケージ（名前, オプション）。行はインポート時に1回だけ
+# 整形し、各インスタンスは辞書のコピーから始める
+_DEFAULT_PACKAGES = (
+    ("amsmath", None),
+    ("amsfonts", None),
+    ("amssymb", None),
+    ("inputenc", "[utf8]"),
+    ("fontenc", "[T1]"),
+    ("graphicx", None),
+    ("hyperref", None),
+    ("tcolorbox", None),
+    ("CJKutf8", None),
+)
+_DEFAULT_PACKAGE_LINES = {
+    package: _render_usepackage(package, options)
+    for package, options in _DEFAULT_PACKAGES
+}
+
+# fontspec使用時に出力しないパッケージ（xeCJK/fontspecと競合・重複する）
+_FONTSPEC_SKIP = frozenset({"CJKutf8", "inputenc", "fontenc"})
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_font_setup(font_file: str,
+                        font_name: Optional[str]) -> Tuple[str, str, str, Optional[str]]:
+    """
+    フォントファイルからsetCJKmainfontに必要な情報を解決する
+
+    パス解決と太字フォントの探索（exists/globによるstatの束）は
+    同じフォントに対して毎回同じ結果になるため、モジュールレベルで
+    メモ化する。フォントディレクトリの内容が実行中に変わらないことが
+    前提（通常のバッチ生成では成立）。
+
+    Returns:
+        (表示名, 引用符付きフォントディレクトリ, ファイル名, 太字ファイル名orNone)
+    """
+    font_path = Path(font_file)
+    font_filename = font_path.name
+    font_display_name = font_name or font_path.stem
+
+    # 出力ディレクトリからの相対パスを計算
+    # フォントファイルがoutput_dir/fonts/にある場合（process_fontsでコピー後）
+    # 絶対パスならgetcwd()を伴うabsolute()を省く（process_fonts経由の
+    # パスは常に絶対）
+    font_abs_path = font_path if font_path.is_absolute() else font_path.absolute()
+
+    # 親ディレクトリ名がfontsなら相対パスを使用（process_fontsは
+    # output_dir/fonts/にコピーする）。従来のパス全体に対する部分文字列
+    # 検索は /home/fontsmith/ のような無関係なパスにも一致していた
+    if font_abs_path.parent.name.lower() == "fonts":
+        # 相対パスを使用（LaTeXの作業ディレクトリから見た相対パス）
+        font_dir = "fonts"
+    else:
+        # 絶対パスを使用（フォントファイルが別の場所にある場合）
+        font_dir = str(font_abs_path.parent).replace("\\", "/")
+
+    # パスにスペースが含まれている場合は引用符で囲む
+    if " " in font_dir and not font_dir.startswith('"'):
+        font_dir_quoted = f'"{font_dir}"'
+    else:
+        font_dir_quoted = font_dir
+
+    # 太字フォントを自動検出
+    bold_font_filename = None
+    font_stem = font_path.stem
+    font_parent = font_path.parent
+
+    # 一般的な太字フォント名のパターンをチェック
+    # （dict.fromkeysで挿入順を保ったまま重複を除去。stemにRegularが
+    # 含まれない場合、replaceの無変化分はここで1つに畳まれる）
+    bold_patterns = dict.fromkeys((
+        font_stem.replace("Regular", "Bold"),
+        font_stem.replace("-Regular", "-Bold"),
+        font_stem.replace("_Regular", "_Bold"),
+        font_stem + "Bold",
+        font_stem + "-Bold",
+        font_stem + "_Bold",
+    ))
+
+    # ディレクトリを1回だけ走査し、以降は辞書引きで判定する
+    # （パターンごとのexists()と拡張子別のglob()はそれぞれディレクトリの
+    # 再読込を伴う。従来の「出力ディレクトリのfontsフォルダも確認」は
+    # font_abs_path.parentと同じディレクトリを走査し直すだけだったので、
+    # 1回の走査に統合される）
+    try:
+        entries = {e.name for e in os.scandir(font_parent) if e.is_file()}
+    except OSError:
+        entries = set()
+
+    # まず、フォントファイルと同じディレクトリ内を検索
+    for pattern in bold_patterns:
+        candidate = f"{pattern}{font_path.suffix}"
+        if candidate in entries:
+            bold_font_filename = candidate
+            break
+
+    # パターンで見つからない場合、同じディレクトリ内の他の太字フォントを検索
+    # （従来のglob("*Bold*.ttf") → glob("*Bold*.otf")と同じ優先順）
+    if bold_font_filename is None:
+        for suffix in (".ttf", ".otf"):
+            for name in sorted(entries):
+                if "Bold" in name and name.endswith(suffix):
+                    bold_font_filename = name
+                    break
+            if bold_font_filename is not None:
+                break
+
+    return font_display_name, font_dir_quoted, font_filename, bold_font_filename
+
+
 class PreambleManager:
     """プリアンブルを管理するクラス"""
     
     def __init__(self):
-        self.packages: Dict[str, Optional[str]] = {}
+        # パッケージ名 -> レンダリング済みの\usepackage行
+        # （行の整形はadd_package時に1回だけ行い、generate_preambleは
+        # 結合するだけにする。dictなので同名パッケージは上書きされる）
+        self._package_lines: Dict[str, str] = dict(_DEFAULT_PACKAGE_LINES)
         self.custom_commands: List[str] = []
-        self._add_default_packages()
-    
-    def _add_default_packages(self):
-        """デフォルトパッケージを追加"""
-        defaults = {
-            "amsmath": None,
-            "amsfonts": None,
-            "amssymb": None,
-            "inputenc": "[utf8]",
-            "fontenc": "[T1]",
-            "graphicx": None,
-            "hyperref": None,
-            "tcolorbox": None,
-            "CJKutf8": None
-        }
-        self.packages.update(defaults)
-    
+        # 生成済みプリアンブルのキャッシュ（キー: パッケージ・コマンド・
+        # 余白・フォント等の入力一式）。バッチ生成では同じ設定の
+        # ドキュメントが続くため、2冊目以降の生成を辞書引きで済ませる
+        self._preamble_cache: Dict[tuple, str] = {}
+
     def add_package(self, package: str, options: Optional[str] = None):
         """パッケージを追加"""
-        self.packages[package] = options
+        self._package_lines[package] = _render_usepackage(package, options)
         return self
     
     def add_command(self, command: str):
         """カスタムコマンドを追加"""
         self.custom_commands.append(command)
         return self
+
+    def _write_packages(self, buf: io.StringIO, skip: frozenset = frozenset()):
+        """登録済みの\\usepackage行をバッファへ書き込む"""
+        if skip:
+            for package, line in self._package_lines.items():
+                if package not in skip:
+                    buf.write(line)
+        else:
+            for line in self._package_lines.values():
+                buf.write(line)
+
+    @staticmethod
+    def _write_font_config(buf: io.StringIO, font_file: str,
+                           font_name: Optional[str]):
+        """setCJKmainfontによるフォント設定をバッファへ書き込む"""
+        (font_display_name, font_dir_quoted,
+         font_filename, bold_font_filename) = _resolve_font_setup(
+            font_file, font_name)
+
+        # フォントファイルを設定（xeCJKを使用）
+        if bold_font_filename:
+            # 太字フォントが存在する場合はBoldFontオプションを追加
+            buf.write(f"\n% フォント設定\n\\setCJKmainfont{{{font_display_name}}}[Path={font_dir_quoted}/, UprightFont={font_filename}, BoldFont={bold_font_filename}]\n\n")
+        else:
+            # 太字フォントが見つからない場合は通常フォントのみ設定
+            buf.write(f"\n% フォント設定\n\\setCJKmainfont{{{font_display_name}}}[Path={font_dir_quoted}/, UprightFont={font_filename}]\n\n")
     
     def generate_preamble(self, margins: Optional[Dict[str, str]] = None,
                          line_spacing: Optional[float] = None,
@@ -52,151 +189,59 @@ class PreambleManager:
             font_file: フォントファイルのパス（.ttf, .otfなど）
             font_name: フォント名（フォントファイルが指定された場合に使用）
         """
-        latex = []
-        latex.append("\\documentclass[a4paper]{article}\n")
-        
-        # フォントファイルが指定された場合は、fontspecパッケージを使用
-        use_fontspec = font_file is not None
-        
-        if use_fontspec:
-            # fontspecパッケージを追加（XeLaTeX/LuaLaTeX用）
-            latex.append("\\usepackage{fontspec}\n")
-            latex.append("\\usepackage{xeCJK}\n")  # 日本語フォント用
+        # 入力一式をキーにして生成結果を再利用する。太字フォントの探索は
+        # ファイルシステムを参照するため、フォントディレクトリの内容が
+        # 生成の合間に変わらないこと（通常のバッチ生成では成立）が前提
+        cache_key = (
+            tuple(self._package_lines.items()),
+            tuple(self.custom_commands),
+            tuple(sorted(margins.items())) if margins else None,
+            line_spacing,
+            font_file,
+            font_name,
+        )
+        cached = self._preamble_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # レンダラーと同様に1つのバッファへ直接書き込む
+        # （appendの積み上げ + 最後のjoinより中間オブジェクトが少ない）
+        buf = io.StringIO()
+        buf.write("\\documentclass[a4paper]{article}\n")
+
+        # フォントファイルが指定された場合は、fontspecパッケージを使用。
+        # 分岐はここで1回だけ行い、各経路を直線的に保つ
+        if font_file is not None:
+            # fontspecパッケージを追加（XeLaTeX/LuaLaTeX用）。xeCJKは日本語フォント用
+            buf.write("\\usepackage{fontspec}\n\\usepackage{xeCJK}\n")
             # CJKutf8は不要なのでスキップ
-            packages_to_skip = {"CJKutf8", "inputenc", "fontenc"}
+            self._write_packages(buf, _FONTSPEC_SKIP)
+            self._write_font_config(buf, font_file, font_name)
         else:
-            packages_to_skip = set()
-        
-        for package, options in self.packages.items():
-            if package in packages_to_skip:
-                continue
-            if options:
-                latex.append(f"\\usepackage{options}{{{package}}}\n")
-            else:
-                latex.append(f"\\usepackage{{{package}}}\n")
-        
-        # フォントファイルが指定された場合の設定
-        if use_fontspec and font_file:
-            font_path = Path(font_file)
-            font_filename = font_path.name
-            font_display_name = font_name or font_path.stem
-            
-            # 出力ディレクトリからの相対パスを計算
-            # フォントファイルがoutput_dir/fonts/にある場合（process_fontsでコピー後）
-            font_abs_path = font_path.absolute()
-            font_dir_str = str(font_abs_path.parent).replace("\\", "/")
-            
-            # fonts/ディレクトリが含まれている場合は相対パスを使用
-            if "/fonts" in font_dir_str.lower() or "\\fonts" in font_dir_str.lower():
-                # 相対パスを使用（LaTeXの作業ディレクトリから見た相対パス）
-                font_dir = "fonts"
-            else:
-                # 絶対パスを使用（フォントファイルが別の場所にある場合）
-                font_dir = font_dir_str
-            
-            # パスにスペースが含まれている場合は引用符で囲む
-            if " " in font_dir and not font_dir.startswith('"'):
-                font_dir_quoted = f'"{font_dir}"'
-            else:
-                font_dir_quoted = font_dir
-            
-            # 太字フォントを自動検出
-            bold_font_filename = None
-            font_stem = font_path.stem
-            font_parent = font_path.parent
-            
-            # 一般的な太字フォント名のパターンをチェック
-            bold_patterns = [
-                font_stem.replace("Regular", "Bold"),
-                font_stem.replace("-Regular", "-Bold"),
-                font_stem.replace("_Regular", "_Bold"),
-                font_stem + "Bold",
-                font_stem + "-Bold",
-                font_stem + "_Bold",
-            ]
-            
-            # 既存のパターンから重複を除去
-            bold_patterns = list(dict.fromkeys(bold_patterns))
-            
-            # まず、フォントファイルと同じディレクトリ内を検索
-            for pattern in bold_patterns:
-                bold_font_path = font_parent / f"{pattern}{font_path.suffix}"
-                if bold_font_path.exists():
-                    bold_font_filename = bold_font_path.name
-                    break
-            
-            # 太字フォントが見つからない場合、同じディレクトリ内の他の太字フォントを検索
-            if bold_font_filename is None:
-                for bold_file in font_parent.glob("*Bold*.ttf"):
-                    if bold_file.exists():
-                        bold_font_filename = bold_file.name
-                        break
-                # Bold.otfも検索
-                if bold_font_filename is None:
-                    for bold_file in font_parent.glob("*Bold*.otf"):
-                        if bold_file.exists():
-                            bold_font_filename = bold_file.name
-                            break
-            
-            # 出力ディレクトリのfontsフォルダも確認（process_fontsでコピーされた後）
-            # font_dirが"fonts"の場合、出力ディレクトリのfontsフォルダを確認
-            if bold_font_filename is None and font_dir == "fonts":
-                # font_abs_pathから出力ディレクトリを推測
-                # font_abs_pathがoutput_dir/fonts/にある場合
-                output_fonts_dir = font_abs_path.parent
-                if output_fonts_dir.exists() and output_fonts_dir.name == "fonts":
-                    for pattern in bold_patterns:
-                        bold_font_path = output_fonts_dir / f"{pattern}{font_path.suffix}"
-                        if bold_font_path.exists():
-                            bold_font_filename = bold_font_path.name
-                            break
-                    
-                    if bold_font_filename is None:
-                        for bold_file in output_fonts_dir.glob("*Bold*.ttf"):
-                            if bold_file.exists():
-                                bold_font_filename = bold_file.name
-                                break
-                        if bold_font_filename is None:
-                            for bold_file in output_fonts_dir.glob("*Bold*.otf"):
-                                if bold_file.exists():
-                                    bold_font_filename = bold_file.name
-                                    break
-            
-            latex.append("\n% フォント設定\n")
-            # フォントファイルを設定（xeCJKを使用）
-            if bold_font_filename:
-                # 太字フォントが存在する場合はBoldFontオプションを追加
-                latex.append(f"\\setCJKmainfont{{{font_display_name}}}[Path={font_dir_quoted}/, UprightFont={font_filename}, BoldFont={bold_font_filename}]\n")
-            else:
-                # 太字フォントが見つからない場合は通常フォントのみ設定
-                latex.append(f"\\setCJKmainfont{{{font_display_name}}}[Path={font_dir_quoted}/, UprightFont={font_filename}]\n")
-            latex.append("\n")
-        
+            self._write_packages(buf)
+
         # 余白設定がある場合はgeometryパッケージを追加
         if margins:
-            margin_options = []
-            if "top" in margins:
-                margin_options.append(f"top={margins['top']}")
-            if "bottom" in margins:
-                margin_options.append(f"bottom={margins['bottom']}")
-            if "left" in margins:
-                margin_options.append(f"left={margins['left']}")
-            if "right" in margins:
-                margin_options.append(f"right={margins['right']}")
-            
+            # 出力順は固定（top, bottom, left, right）
+            margin_options = [f"{key}={margins[key]}"
+                              for key in ("top", "bottom", "left", "right")
+                              if key in margins]
+
             if margin_options:
                 # geometryパッケージを追加（パッケージリストには追加しない）
-                latex.append(f"\\usepackage[{','.join(margin_options)}]{{geometry}}\n")
+                buf.write(f"\\usepackage[{','.join(margin_options)}]{{geometry}}\n")
         
         # 行間設定がある場合はsetspaceパッケージを追加
         if line_spacing is not None:
-            latex.append("\\usepackage{setspace}\n")
-            latex.append(f"\\setstretch{{{line_spacing}}}\n")
+            buf.write(f"\\usepackage{{setspace}}\n\\setstretch{{{line_spacing}}}\n")
         
         if self.custom_commands:
-            latex.append("\n")
-            latex.extend(self.custom_commands)
-            latex.append("\n")
-        
-        return "".join(latex)
+            buf.write("\n")
+            for command in self.custom_commands:
+                buf.write(command)
+            buf.write("\n")
+
+        preamble = buf.getvalue()
+        self._preamble_cache[cache_key] = preamble
+        return preamble
 
@@ -0,0 +1,9 @@
+"""
+ドキュメント間で共有するスタイル定数
+"""
+
+# 数式の上下余白を詰めるtcolorbox用スタイル
+# （TextBox/add_textboxのstyle引数にそのまま渡せる）
+MATH_BOX_STYLE = {
+    "before upper": r"{\setlength{\abovedisplayskip}{5pt}\setlength{\belowdisplayskip}{5pt}\setlength{\abovedisplayshortskip}{0pt}\setlength{\belowdisplayshortskip}{0pt}}"
+}
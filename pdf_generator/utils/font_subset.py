@@ -0,0 +1,72 @@
+"""
+フォントサブセット化のユーティリティ
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+
+def subset_font(font_file: str, text: str, cache_dir: str,
+                output_stem: Optional[str] = None) -> Optional[str]:
+    """
+    ドキュメントで使用される文字だけを含むサブセットフォントを生成
+
+    CJKフォントは数MBあり、XeLaTeX/LuaLaTeXの起動時のフォントテーブル
+    構築が支配的なコストになる。実際に使われる数百グリフだけに絞った
+    サブセットを渡すことで、読み込みとPDFへの埋め込みを大幅に軽くする。
+    結果は（フォントパス, 更新時刻, 使用コードポイント）のハッシュを
+    キーにキャッシュされる。
+
+    fontToolsがインストールされていない場合や生成に失敗した場合は
+    Noneを返し、呼び出し側は元のフォントをそのまま使用する。
+
+    Args:
+        font_file: 元のフォントファイルのパス
+        text: ドキュメントの内容（使用コードポイントの抽出元）
+        cache_dir: サブセットフォントのキャッシュディレクトリ
+        output_stem: 出力ファイル名（拡張子なし）。省略時は
+            「元のファイル名-ハッシュ」形式で自動生成
+
+    Returns:
+        サブセットフォントのパス（生成できない場合はNone）
+    """
+    try:
+        from fontTools import subset
+    except ImportError:
+        return None
+
+    font_path = Path(font_file)
+    if not font_path.exists():
+        return None
+
+    # 使用コードポイントを収集（LaTeXコマンド内のASCIIも含めて安全側に倒す）
+    codepoints = sorted({ord(ch) for ch in text})
+
+    key_source = (
+        f"{font_path.resolve()}\n"
+        f"{font_path.stat().st_mtime_ns}\n"
+        + ",".join(map(str, codepoints))
+    )
+    digest = hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+
+    stem = output_stem or f"{font_path.stem}-{digest}"
+    cache_path = Path(cache_dir)
+    subset_file = cache_path / f"{stem}{font_path.suffix}"
+    if subset_file.exists():
+        return str(subset_file)
+
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    try:
+        options = subset.Options()
+        options.name_IDs = ['*']  # フォント名をfontspecで参照できるよう保持
+        font = subset.load_font(str(font_path), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, str(subset_file), options)
+    except Exception:
+        return None
+
+    return str(subset_file)